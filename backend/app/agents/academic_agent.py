@@ -1,19 +1,13 @@
-from openai import OpenAI
-from config import settings
 from typing import List, Dict
 import json
-
-client = OpenAI(
-    api_key=settings.OPENAI_API_KEY,
-    base_url="https://api.groq.com/openai/v1"
-)
+from app.agents.llm_gateway import llm_gateway
 
 
 class AcademicAgent:
     """AI Agent for academic planning and skill mapping."""
     
     @staticmethod
-    def generate_skill_roadmap(subjects: List[Dict], career_goal: str = None) -> Dict:
+    async def generate_skill_roadmap(subjects: List[Dict], career_goal: str = None) -> Dict:
         """Generate a skill roadmap from enrolled subjects."""
         
         if not subjects:
@@ -54,8 +48,7 @@ Return a JSON with this structure:
 }}"""
 
         try:
-            response = client.chat.completions.create(
-                model="llama-3.1-8b-instant",
+            content = await llm_gateway.complete(
                 messages=[
                     {"role": "system", "content": "You are an expert academic advisor helping students map courses to practical skills."},
                     {"role": "user", "content": prompt}
@@ -64,7 +57,7 @@ Return a JSON with this structure:
                 response_format={"type": "json_object"}
             )
             
-            result = json.loads(response.choices[0].message.content)
+            result = json.loads(content)
             
             # Calculate totals
             total_skills = sum(len(item.get("skills", [])) for item in result.get("roadmap", []))
@@ -102,7 +95,7 @@ Return a JSON with this structure:
             }
     
     @staticmethod
-    def generate_subject_concepts(subject_name: str) -> List[str]:
+    async def generate_subject_concepts(subject_name: str) -> List[str]:
         """Generate 4-5 key concepts for a subject."""
         prompt = f"""You are an educational expert. Generate exactly 5 key fundamental concepts for the subject: {subject_name}
 
@@ -116,8 +109,7 @@ Return ONLY a JSON array of concept names (strings), nothing else.
 Example: ["Concept 1", "Concept 2", "Concept 3", "Concept 4", "Concept 5"]"""
 
         try:
-            response = client.chat.completions.create(
-                model="llama-3.1-8b-instant",
+            content = await llm_gateway.complete(
                 messages=[
                     {"role": "system", "content": "You are an expert educator. Return only valid JSON arrays."},
                     {"role": "user", "content": prompt}
@@ -125,33 +117,31 @@ Example: ["Concept 1", "Concept 2", "Concept 3", "Concept 4", "Concept 5"]"""
                 temperature=0.7
             )
             
-            content = response.choices[0].message.content.strip()
+            content = content.strip()
             concepts = json.loads(content)
             
             # Ensure it's a list and has 5 items
             if isinstance(concepts, list):
                 return concepts[:5] if len(concepts) >= 5 else concepts
             
-            return [
-                f"Fundamental concept of {subject_name}",
-                f"Core principles in {subject_name}",
-                f"Advanced topics in {subject_name}",
-                f"Practical applications of {subject_name}",
-                f"Real-world {subject_name} problems"
-            ]
+            return AcademicAgent.fallback_concepts(subject_name)
             
         except Exception as e:
-            # Fallback concepts
-            return [
-                f"Introduction to {subject_name}",
-                f"Core principles of {subject_name}",
-                f"Advanced {subject_name} concepts",
-                f"Applications of {subject_name}",
-                f"{subject_name} best practices"
-            ]
+            return AcademicAgent.fallback_concepts(subject_name)
+    
+    @staticmethod
+    def fallback_concepts(subject_name: str) -> List[str]:
+        """Generic concepts used when the LLM is unavailable or returns garbage."""
+        return [
+            f"Introduction to {subject_name}",
+            f"Core principles of {subject_name}",
+            f"Advanced {subject_name} concepts",
+            f"Applications of {subject_name}",
+            f"{subject_name} best practices"
+        ]
     
     @staticmethod
-    def generate_project_task(subject_name: str, concepts: List[str]) -> str:
+    async def generate_project_task(subject_name: str, concepts: List[str]) -> str:
         """Generate a comprehensive project task covering all concepts."""
         concepts_text = "\n".join([f"- {c}" for c in concepts])
         
@@ -177,8 +167,7 @@ Write a clear, detailed project description (200-300 words) that explains:
 Return ONLY the project description text, no JSON."""
 
         try:
-            response = client.chat.completions.create(
-                model="llama-3.1-8b-instant",
+            content = await llm_gateway.complete(
                 messages=[
                     {"role": "system", "content": "You are an experienced professor who creates engaging, practical project assignments."},
                     {"role": "user", "content": prompt}
@@ -186,7 +175,7 @@ Return ONLY the project description text, no JSON."""
                 temperature=0.8
             )
             
-            return response.choices[0].message.content.strip()
+            return content.strip()
             
         except Exception as e:
             # Fallback task
@@ -205,7 +194,7 @@ Deliverables:
 This project will showcase your understanding and ability to apply {subject_name} principles in real-world scenarios."""
 
     @staticmethod
-    def generate_formatted_cv(cv_data: Dict, format_type: str) -> str:
+    async def generate_formatted_cv(cv_data: Dict, format_type: str) -> str:
         """Generate a formatted CV based on the selected format.
         Only includes fields that have actual data - no dummy/placeholder values.
         """
@@ -421,8 +410,7 @@ IMPORTANT INSTRUCTIONS:
 8. Return ONLY the formatted CV text, no explanations or metadata."""
 
         try:
-            response = client.chat.completions.create(
-                model="llama-3.1-8b-instant",
+            content = await llm_gateway.complete(
                 messages=[
                     {"role": "system", "content": f"You are an expert CV writer specializing in {format_type} format CVs. Create professional, compelling CVs that highlight candidates' strengths."},
                     {"role": "user", "content": prompt}
@@ -431,7 +419,7 @@ IMPORTANT INSTRUCTIONS:
                 max_tokens=2500
             )
             
-            return response.choices[0].message.content.strip()
+            return content.strip()
             
         except Exception as e:
             # Fallback CV
@@ -0,0 +1,99 @@
+"""Shared async gateway for all LLM calls (agents and EduBot chat).
+
+Every completion goes through a single ``AsyncOpenAI`` client so requests
+share one HTTP connection pool, respect a per-worker concurrency cap and a
+per-call timeout, and never block the event loop.
+"""
+import asyncio
+from typing import AsyncIterator, Dict, List, Optional
+
+import httpx
+from openai import AsyncOpenAI
+
+from config import settings
+
+
+class LLMGateway:
+    """Non-blocking wrapper around the Groq OpenAI-compatible API."""
+
+    def __init__(self):
+        self._client: Optional[AsyncOpenAI] = None
+        self._semaphore = asyncio.Semaphore(settings.LLM_MAX_CONCURRENCY)
+
+    @property
+    def client(self) -> AsyncOpenAI:
+        """Lazily build the client so importing agents never needs a key."""
+        if self._client is None:
+            http_client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=settings.LLM_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.LLM_MAX_CONNECTIONS,
+                ),
+                timeout=settings.LLM_TIMEOUT_SECONDS,
+            )
+            self._client = AsyncOpenAI(
+                api_key=settings.OPENAI_API_KEY,
+                base_url=settings.LLM_BASE_URL,
+                timeout=settings.LLM_TIMEOUT_SECONDS,
+                max_retries=settings.LLM_MAX_RETRIES,
+                http_client=http_client,
+            )
+        return self._client
+
+    async def complete(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        response_format: Optional[Dict[str, str]] = None,
+        model: Optional[str] = None,
+    ) -> str:
+        """Run a chat completion and return the assistant message text."""
+        kwargs = {
+            "model": model or settings.LLM_MODEL,
+            "messages": messages,
+            "temperature": temperature,
+        }
+        if max_tokens is not None:
+            kwargs["max_tokens"] = max_tokens
+        if response_format is not None:
+            kwargs["response_format"] = response_format
+
+        async with self._semaphore:
+            response = await self.client.chat.completions.create(**kwargs)
+
+        return response.choices[0].message.content
+
+    async def stream(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        model: Optional[str] = None,
+    ) -> AsyncIterator[str]:
+        """Yield assistant text fragments as the model produces them."""
+        kwargs = {
+            "model": model or settings.LLM_MODEL,
+            "messages": messages,
+            "temperature": temperature,
+            "stream": True,
+        }
+        if max_tokens is not None:
+            kwargs["max_tokens"] = max_tokens
+
+        async with self._semaphore:
+            response = await self.client.chat.completions.create(**kwargs)
+            # Closing the stream releases the connection if the caller stops early
+            async with response:
+                async for chunk in response:
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        yield chunk.choices[0].delta.content
+
+    async def close(self):
+        """Release pooled connections on application shutdown."""
+        if self._client is not None:
+            await self._client.close()
+            self._client = None
+
+
+llm_gateway = LLMGateway()
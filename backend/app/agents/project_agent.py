@@ -1,19 +1,13 @@
-from openai import OpenAI
-from config import settings
 from typing import Dict
 import json
-
-client = OpenAI(
-    api_key=settings.OPENAI_API_KEY,
-    base_url="https://api.groq.com/openai/v1"
-)
+from app.agents.llm_gateway import llm_gateway
 
 
 class ProjectAgent:
     """AI Agent for generating project ideas and requirements."""
     
     @staticmethod
-    def generate_project(subject_name: str, subject_description: str = None, difficulty: str = "Intermediate") -> Dict:
+    async def generate_project(subject_name: str, subject_description: str = None, difficulty: str = "Intermediate") -> Dict:
         """Generate a resume-worthy project for a subject."""
         
         prompt = f"""You are a project design AI. Create a practical, resume-worthy project.
@@ -42,8 +36,7 @@ Return JSON with this structure:
 }}"""
 
         try:
-            response = client.chat.completions.create(
-                model="llama-3.1-8b-instant",
+            content = await llm_gateway.complete(
                 messages=[
                     {"role": "system", "content": "You are an expert project designer who creates practical, resume-worthy projects for students."},
                     {"role": "user", "content": prompt}
@@ -52,7 +45,7 @@ Return JSON with this structure:
                 response_format={"type": "json_object"}
             )
             
-            result = json.loads(response.choices[0].message.content)
+            result = json.loads(content)
             return result
             
         except Exception as e:
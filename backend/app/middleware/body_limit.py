@@ -0,0 +1,44 @@
+"""Rejects request bodies over a size limit before they are parsed.
+
+Starlette spools multipart uploads to a temporary file before the endpoint
+runs, so a size check in the endpoint comes after the whole body has been
+received. This middleware answers 413 straight away when Content-Length is
+too large, and stops reading chunked bodies once they pass the limit.
+"""
+from fastapi import HTTPException, status
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+TOO_LARGE_DETAIL = "Request body too large"
+
+
+class BodySizeLimitMiddleware:
+    def __init__(self, app: ASGIApp, max_body_size: int):
+        self.app = app
+        self.max_body_size = max_body_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        content_length = Headers(scope=scope).get("content-length")
+        if content_length is not None and content_length.isdigit() and int(content_length) > self.max_body_size:
+            response = JSONResponse({"detail": TOO_LARGE_DETAIL}, status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+            await response(scope, receive, send)
+            return
+
+        received = 0
+
+        async def limited_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_body_size:
+                    # Raised inside body parsing, which FastAPI turns into the 413 response
+                    raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=TOO_LARGE_DETAIL)
+            return message
+
+        await self.app(scope, limited_receive, send)
@@ -1,6 +1,8 @@
 # Database models
 from .user import User
-from .academic import Subject, Skill
+from .academic import Subject, Skill, Concept, Submission, ConceptCache
 from .project import Project, Milestone
 from .cv import CV
 from .chat import ChatSession, ChatMessage
+from .job import Job
+from .idempotency import IdempotencyKey
@@ -1,7 +1,8 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Float, JSON
+from sqlalchemy import Boolean, Column, Integer, String, DateTime, ForeignKey, Text, Float, JSON, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from database import Base
+from app.utils.jsonb import JSONDocument
 
 
 # Subject status constants
@@ -23,12 +24,53 @@ class Subject(Base):
     description = Column(Text)
     status = Column(String, default=SubjectStatus.IN_PROGRESS)  # 'in_progress' or 'completed'
     progress = Column(Integer, default=0)  # 0-100 percentage
-    subject_data = Column(JSON, default={})  # For storing concepts and submissions
+    version = Column(Integer, nullable=False, default=1, server_default="1")  # Bumped on every write; compare-and-swap guard
+    subject_data = Column(JSONDocument, default={})  # Free-form extras; concepts and submissions have their own tables
+    generated_task = Column(Text, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     
     # Relationships
     user = relationship("User", back_populates="subjects")
     skills = relationship("Skill", back_populates="subject")
+    # The database deletes concepts and submissions with their subject (ON DELETE CASCADE)
+    concepts = relationship("Concept", back_populates="subject", cascade="all, delete-orphan", passive_deletes=True, order_by="Concept.position")
+    submissions = relationship("Submission", back_populates="subject", cascade="all, delete-orphan", passive_deletes=True, order_by="Submission.position")
+
+
+class Concept(Base):
+    __tablename__ = "concepts"
+    __table_args__ = (
+        Index("ix_concepts_subject_id_position", "subject_id", "position"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    subject_id = Column(Integer, ForeignKey("subjects.id", ondelete="CASCADE"), nullable=False)
+    position = Column(Integer, nullable=False)  # 1-based display order
+    name = Column(String, nullable=False)
+    learned = Column(Boolean, default=False, nullable=False)
+    
+    # Relationships
+    subject = relationship("Subject", back_populates="concepts")
+
+
+class Submission(Base):
+    __tablename__ = "submissions"
+    __table_args__ = (
+        Index("ix_submissions_subject_id_position", "subject_id", "position"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    subject_id = Column(Integer, ForeignKey("subjects.id", ondelete="CASCADE"), nullable=False)
+    position = Column(Integer, nullable=False)  # 1-based, in submission order
+    task = Column(Text)
+    github_link = Column(String, nullable=True)
+    documentation = Column(String)  # Uploaded file name
+    document_key = Column(String(64), nullable=True)  # SHA-256 of the file; its key in file_storage
+    document_size = Column(Integer, nullable=True)  # Bytes
+    submitted_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    # Relationships
+    subject = relationship("Subject", back_populates="submissions")
 
 
 class Skill(Base):
@@ -36,7 +78,7 @@ class Skill(Base):
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
-    subject_id = Column(Integer, ForeignKey("subjects.id"), nullable=True)
+    subject_id = Column(Integer, ForeignKey("subjects.id"), nullable=True, index=True)
     name = Column(String, nullable=False)
     category = Column(String)  # Technical, Soft, Domain-specific
     proficiency_level = Column(Float, default=0.0)  # 0-100
@@ -48,3 +90,25 @@ class Skill(Base):
     # Relationships
     user = relationship("User", back_populates="skills")
     subject = relationship("Subject", back_populates="skills")
+
+
+# Per-user listing and case-insensitive name lookups
+Index("ix_subjects_user_id_lower_name", Subject.user_id, func.lower(Subject.name))
+Index("ix_skills_user_id_lower_name", Skill.user_id, func.lower(Skill.name))
+# Containment (@>) queries on the free-form document; JSONB only
+Index(
+    "ix_subjects_subject_data", Subject.subject_data,
+    postgresql_using="gin", postgresql_ops={"subject_data": "jsonb_path_ops"}
+).ddl_if(dialect="postgresql")
+
+
+class ConceptCache(Base):
+    """LLM-generated concepts shared across users, keyed by normalised subject name."""
+    __tablename__ = "concept_cache"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    subject_key = Column(String(64), unique=True, index=True, nullable=False)  # sha256 of normalised name
+    normalized_name = Column(String, nullable=False)
+    concepts = Column(JSON, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    last_used_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
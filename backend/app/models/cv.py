@@ -1,7 +1,8 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Boolean, JSON, Float
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Boolean, JSON, Float, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from database import Base
+from app.utils.jsonb import JSONDocument
 
 
 class CV(Base):
@@ -22,9 +23,9 @@ class CV(Base):
     # Professional Summary
     summary = Column(Text)
     
-    # Education, Experience, Skills stored as JSON
-    education = Column(JSON)  # Array of education objects
-    experience = Column(JSON)  # Array of work experience objects
+    # Education, Experience, Skills stored as JSON (JSONB on PostgreSQL)
+    education = Column(JSONDocument)  # Array of education objects
+    experience = Column(JSONDocument)  # Array of work experience objects
     
     # Skills (stored as comma-separated strings or JSON)
     technical_skills = Column(Text)
@@ -32,8 +33,8 @@ class CV(Base):
     languages = Column(Text)
     
     # Certifications and Projects
-    certifications = Column(JSON)  # Array of certification objects
-    projects = Column(JSON)  # Array of project objects
+    certifications = Column(JSONDocument)  # Array of certification objects
+    projects = Column(JSONDocument)  # Array of project objects
     
     # Legacy fields (kept for backward compatibility)
     skills = Column(JSON)  # Store skills array as JSON
@@ -46,6 +47,10 @@ class CV(Base):
 
 class Opportunity(Base):
     __tablename__ = "opportunities"
+    __table_args__ = (
+        # Listing is ordered by match score
+        Index("ix_opportunities_user_id_match_score", "user_id", "match_score"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
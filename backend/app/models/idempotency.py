@@ -0,0 +1,20 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, JSON, Index
+from sqlalchemy.sql import func
+from database import Base
+
+
+class IdempotencyKey(Base):
+    """The stored response for a client-supplied ``Idempotency-Key``."""
+    __tablename__ = "idempotency_keys"
+    __table_args__ = (
+        Index("ix_idempotency_keys_user_id_key", "user_id", "key", unique=True),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    key = Column(String(255), nullable=False)
+    operation = Column(String, nullable=False)  # e.g. 'generate_task:12'; a key can't be reused for another
+    status_code = Column(Integer, nullable=True)  # NULL while the first request is still running
+    response = Column(JSON, nullable=True)
+    response_headers = Column(JSON, nullable=True)  # e.g. Location of a 202 job response
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)  # Expiry sweeps
@@ -0,0 +1,31 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, JSON
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+from database import Base
+
+
+# Job status constants
+class JobStatus:
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+class Job(Base):
+    """A long-running AI generation request executed in the background."""
+    __tablename__ = "jobs"
+    
+    id = Column(String(32), primary_key=True)  # uuid4 hex
+    user_id = Column(Integer, ForeignKey("users.id"), index=True)
+    kind = Column(String, nullable=False)  # e.g. 'roadmap', 'generate_task'
+    status = Column(String, default=JobStatus.QUEUED, nullable=False)
+    result = Column(JSON)
+    error = Column(Text)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    started_at = Column(DateTime(timezone=True))
+    finished_at = Column(DateTime(timezone=True), index=True)  # Retention sweeps
+    heartbeat_at = Column(DateTime(timezone=True))  # Refreshed by the worker while queued or running
+    
+    # Relationships
+    user = relationship("User", back_populates="jobs")
@@ -29,3 +29,4 @@ class User(Base):
     cv = relationship("CV", back_populates="user", uselist=False, cascade="all, delete-orphan")
     opportunities = relationship("Opportunity", back_populates="user", cascade="all, delete-orphan")
     chat_sessions = relationship("ChatSession", back_populates="user", cascade="all, delete-orphan")
+    jobs = relationship("Job", back_populates="user", cascade="all, delete-orphan")
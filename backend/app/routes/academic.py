@@ -1,42 +1,65 @@
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form
-from sqlalchemy.orm import Session
-from sqlalchemy.orm.attributes import flag_modified
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status, UploadFile, File, Form
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import case, delete, exists, func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 from typing import List, Optional
 import json
 from datetime import datetime, timezone
-from database import get_db
-from app.schemas.academic import SubjectCreate, SubjectResponse, SkillCreate, SkillResponse, SkillRoadmapResponse
-from app.models.academic import Subject, Skill, SubjectStatus
+from database import get_async_db
+from app.schemas.academic import ConceptResponse, SubjectCreate, SubjectResponse, SkillCreate, SkillResponse, SkillRoadmapResponse
+from app.schemas.job import JobSubmittedResponse
+from app.models.academic import Subject, Skill, Concept, Submission, SubjectStatus
 from app.models.project import Project, ProjectStatus
-from app.models.user import User
-from app.utils.auth import get_current_user_id
+from app.schemas.user import UserResponse
+from app.utils.auth import get_current_user, get_current_user_id
+from app.utils.listing import ListParams, paginate
 from app.agents.academic_agent import AcademicAgent
+from app.services.concept_cache_service import ConceptCacheService
+from app.services.job_service import run_or_enqueue
+from app.services.dashboard_service import dashboard_cache
+from app.services.idempotency_service import IdempotencyService
+from app.services.storage_service import save_upload
+from app.utils.single_flight import generation_flights
 
 router = APIRouter()
 
 
 @router.get("/subjects", response_model=List[SubjectResponse])
 async def get_subjects(
+    response: Response,
+    subject_status: Optional[str] = Query(None, alias="status"),
+    semester: Optional[int] = None,
+    year: Optional[int] = None,
+    params: ListParams = Depends(),
     user_id: int = Depends(get_current_user_id),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Get all subjects for current user."""
-    subjects = db.query(Subject).filter(Subject.user_id == user_id).all()
-    return subjects
+    """Get subjects for current user, optionally filtered and paginated."""
+    query = select(Subject).options(selectinload(Subject.concepts)).filter(Subject.user_id == user_id)
+    if subject_status:
+        query = query.filter(Subject.status == subject_status)
+    if semester is not None:
+        query = query.filter(Subject.semester == semester)
+    if year is not None:
+        query = query.filter(Subject.year == year)
+    
+    return await paginate(db, query, Subject, params, response, order_by=[Subject.id], schema=SubjectResponse)
 
 
 @router.post("/subjects", response_model=SubjectResponse, status_code=status.HTTP_201_CREATED)
 async def create_subject(
     subject_data: SubjectCreate,
     user_id: int = Depends(get_current_user_id),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Add a new subject."""
     # Check if course with same name already exists for this user
-    existing_subject = db.query(Subject).filter(
+    result = await db.execute(select(Subject).filter(
         Subject.user_id == user_id,
-        Subject.name.ilike(subject_data.name)
-    ).first()
+        func.lower(Subject.name) == subject_data.name.lower()
+    ))
+    existing_subject = result.scalars().first()
     
     if existing_subject:
         # Only allow re-adding if the existing subject is completed
@@ -59,8 +82,8 @@ async def create_subject(
         progress=0
     )
     db.add(subject)
-    db.commit()
-    db.refresh(subject)
+    await db.commit()
+    await db.refresh(subject, ["id", "created_at", "concepts"])
     return subject
 
 
@@ -68,13 +91,14 @@ async def create_subject(
 async def get_subject(
     subject_id: int,
     user_id: int = Depends(get_current_user_id),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get a specific subject."""
-    subject = db.query(Subject).filter(
+    result = await db.execute(select(Subject).options(selectinload(Subject.concepts)).filter(
         Subject.id == subject_id,
         Subject.user_id == user_id
-    ).first()
+    ))
+    subject = result.scalars().first()
     
     if not subject:
         raise HTTPException(status_code=404, detail="Subject not found")
@@ -86,37 +110,48 @@ async def get_subject(
 async def delete_subject(
     subject_id: int,
     user_id: int = Depends(get_current_user_id),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Delete a subject."""
-    subject = db.query(Subject).filter(
+    # Skills keep a reference to the subject, so load them for the ORM to unlink
+    result = await db.execute(select(Subject).options(selectinload(Subject.skills)).filter(
         Subject.id == subject_id,
         Subject.user_id == user_id
-    ).first()
+    ))
+    subject = result.scalars().first()
     
     if not subject:
         raise HTTPException(status_code=404, detail="Subject not found")
     
-    db.delete(subject)
-    db.commit()
+    await db.delete(subject)
+    await db.commit()
     return {"message": "Course deleted successfully"}
 
 
 @router.get("/skills", response_model=List[SkillResponse])
 async def get_skills(
+    response: Response,
+    subject_id: Optional[int] = None,
+    category: Optional[str] = None,
+    params: ListParams = Depends(),
     user_id: int = Depends(get_current_user_id),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Get all skills for current user."""
-    skills = db.query(Skill).filter(Skill.user_id == user_id).all()
-    return skills
+    """Get skills for current user, optionally filtered and paginated."""
+    query = select(Skill).filter(Skill.user_id == user_id)
+    if subject_id is not None:
+        query = query.filter(Skill.subject_id == subject_id)
+    if category:
+        query = query.filter(Skill.category == category)
+    
+    return await paginate(db, query, Skill, params, response, order_by=[Skill.id], schema=SkillResponse)
 
 
 @router.post("/skills", response_model=SkillResponse, status_code=status.HTTP_201_CREATED)
 async def create_skill(
     skill_data: SkillCreate,
     user_id: int = Depends(get_current_user_id),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Add a new skill."""
     skill = Skill(
@@ -128,20 +163,34 @@ async def create_skill(
         target_level=skill_data.target_level
     )
     db.add(skill)
-    db.commit()
-    db.refresh(skill)
+    await db.commit()
+    await db.refresh(skill)
     return skill
 
 
-@router.get("/roadmap", response_model=SkillRoadmapResponse)
+@router.get("/roadmap", response_model=SkillRoadmapResponse, responses={202: {"model": JobSubmittedResponse}})
 async def get_skill_roadmap(
-    user_id: int = Depends(get_current_user_id),
-    db: Session = Depends(get_db)
+    background: bool = False,
+    user: UserResponse = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Generate AI-powered skill roadmap from enrolled subjects."""
-    # Get user and subjects
-    user = db.query(User).filter(User.id == user_id).first()
-    subjects = db.query(Subject).filter(Subject.user_id == user_id).all()
+    """Generate AI-powered skill roadmap from enrolled subjects.
+    
+    Pass ``background=true`` to run as a job and poll ``/api/jobs/{job_id}``.
+    """
+    return await run_or_enqueue(
+        background, db, user.id, "roadmap",
+        lambda job_db: build_skill_roadmap(job_db, user)
+    )
+
+
+async def build_skill_roadmap(db: AsyncSession, user: UserResponse) -> dict:
+    """Generate the roadmap with the LLM and save any new skills."""
+    user_id = user.id
+    
+    # Get subjects
+    result = await db.execute(select(Subject).filter(Subject.user_id == user_id))
+    subjects = result.scalars().all()
     
     if not subjects:
         raise HTTPException(
@@ -160,36 +209,41 @@ async def get_skill_roadmap(
     ]
     
     # Generate roadmap using AI
-    roadmap = AcademicAgent.generate_skill_roadmap(
+    roadmap = await AcademicAgent.generate_skill_roadmap(
         subjects_data,
         career_goal=user.career_goal
     )
     
-    # Save skills to database
+    # Save new skills in one round-trip: index subjects by name and
+    # pre-fetch existing skill names instead of querying per skill
+    subjects_by_name = {s.name: s for s in subjects}
+    result = await db.execute(select(Skill.name).filter(Skill.user_id == user_id))
+    existing_names = set(result.scalars().all())
+    
+    new_skills = []
     for subject_roadmap in roadmap.get("roadmap", []):
         # Find the corresponding subject
-        subject = next((s for s in subjects if s.name == subject_roadmap.get("subject")), None)
+        subject = subjects_by_name.get(subject_roadmap.get("subject"))
         
         for skill_data in subject_roadmap.get("skills", []):
-            # Check if skill already exists
-            existing_skill = db.query(Skill).filter(
-                Skill.user_id == user_id,
-                Skill.name == skill_data.get("name")
-            ).first()
+            name = skill_data.get("name")
+            if not name or name in existing_names:
+                continue
+            existing_names.add(name)
             
-            if not existing_skill:
-                # Create new skill
-                skill = Skill(
-                    user_id=user_id,
-                    subject_id=subject.id if subject else None,
-                    name=skill_data.get("name"),
-                    category=skill_data.get("category", "Technical"),
-                    proficiency_level=0,  # Start at 0
-                    target_level=skill_data.get("target_level", 80)
-                )
-                db.add(skill)
-    
-    db.commit()
+            new_skills.append({
+                "user_id": user_id,
+                "subject_id": subject.id if subject else None,
+                "name": name,
+                "category": skill_data.get("category", "Technical"),
+                "proficiency_level": 0,  # Start at 0
+                "target_level": skill_data.get("target_level", 80)
+            })
+    
+    if new_skills:
+        await db.execute(insert(Skill), new_skills)
+        await db.commit()
+        dashboard_cache.invalidate(user_id)
     
     return roadmap
 
@@ -199,152 +253,250 @@ async def update_skill_progress(
     skill_id: int,
     proficiency_level: float,
     user_id: int = Depends(get_current_user_id),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update skill proficiency level."""
-    skill = db.query(Skill).filter(
+    result = await db.execute(select(Skill).filter(
         Skill.id == skill_id,
         Skill.user_id == user_id
-    ).first()
+    ))
+    skill = result.scalars().first()
     
     if not skill:
         raise HTTPException(status_code=404, detail="Skill not found")
     
     skill.proficiency_level = proficiency_level
-    db.commit()
+    await db.commit()
     
     return {"message": "Skill progress updated", "proficiency_level": proficiency_level}
 
 
+async def claim_subject_version(db: AsyncSession, subject_id: int, user_id: int, version: Optional[int], **values):
+    """Compare-and-swap a subject's version, applying ``values`` in the same UPDATE.
+    
+    Returns the updated ``(version, progress)`` row, or None when the subject is
+    missing or its version no longer matches ``version`` (None skips the check).
+    """
+    query = update(Subject).filter(Subject.id == subject_id, Subject.user_id == user_id)
+    if version is not None:
+        query = query.filter(Subject.version == version)
+    result = await db.execute(
+        query.values(version=Subject.version + 1, **values)
+        .returning(Subject.version, Subject.progress)
+        .execution_options(synchronize_session=False)
+    )
+    return result.first()
+
+
+async def subject_conflict(db: AsyncSession, subject_id: int, user_id: int) -> ORJSONResponse:
+    """409 carrying the subject's current state, so the client can re-apply its change."""
+    await db.rollback()
+    result = await db.execute(select(Subject).options(selectinload(Subject.concepts)).filter(
+        Subject.id == subject_id,
+        Subject.user_id == user_id
+    ))
+    subject = result.scalars().first()
+    
+    if not subject:
+        raise HTTPException(status_code=404, detail="Subject not found")
+    
+    return ORJSONResponse(
+        status_code=status.HTTP_409_CONFLICT,
+        content={
+            "detail": "Subject was changed by another request",
+            "subject": SubjectResponse.model_validate(subject).model_dump(mode="json")
+        }
+    )
+
+
 @router.post("/subjects/{subject_id}/concepts")
 async def generate_concepts(
     subject_id: int,
+    regenerate: bool = False,
+    idempotency_key: Optional[str] = Header(None, max_length=255),
     user_id: int = Depends(get_current_user_id),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Generate key concepts for a subject using AI."""
-    from sqlalchemy.orm.attributes import flag_modified
-    
-    subject = db.query(Subject).filter(
+    """Generate key concepts for a subject using AI.
+    
+    Returns the subject's existing concepts unless ``regenerate=true``.
+    A repeated ``Idempotency-Key`` gets the first response back.
+    """
+    return await IdempotencyService.run(
+        user_id, idempotency_key, f"concepts:{subject_id}",
+        lambda: build_concepts(db, user_id, subject_id, regenerate)
+    )
+
+
+async def load_concepts(db: AsyncSession, subject_id: int) -> List[ConceptResponse]:
+    result = await db.execute(select(Concept).filter(Concept.subject_id == subject_id).order_by(Concept.position))
+    return [ConceptResponse.model_validate(c) for c in result.scalars()]
+
+
+async def build_concepts(db: AsyncSession, user_id: int, subject_id: int, regenerate: bool) -> dict:
+    """Return the subject's concepts, generating and saving them if needed."""
+    result = await db.execute(select(Subject).filter(
         Subject.id == subject_id,
         Subject.user_id == user_id
-    ).first()
+    ))
+    subject = result.scalars().first()
     
     if not subject:
         raise HTTPException(status_code=404, detail="Subject not found")
     
-    # Generate concepts using AI
-    concepts = AcademicAgent.generate_subject_concepts(subject.name)
-    
-    # Store concepts in subject metadata
-    if not subject.subject_data:
-        subject.subject_data = {}
-    
-    subject.subject_data['concepts'] = [
-        {"id": i + 1, "name": concept, "learned": False}
-        for i, concept in enumerate(concepts)
+    if not regenerate:
+        existing = await load_concepts(db, subject_id)
+        if existing:
+            return {"concepts": existing}
+    
+    # Generate concepts using AI (served from the shared cache unless regenerating)
+    names = await ConceptCacheService.get_or_generate(subject.name, refresh=regenerate)
+    
+    # Bumping the version locks the subject row, so concurrent callers take turns below
+    await claim_subject_version(db, subject_id, user_id, None)
+    if not regenerate:
+        existing = await load_concepts(db, subject_id)
+        if existing:
+            # Another request saved concepts while we were generating
+            await db.rollback()
+            return {"concepts": existing}
+    
+    # Replace any previous concepts for the subject
+    await db.execute(delete(Concept).filter(Concept.subject_id == subject_id).execution_options(synchronize_session=False))
+    concepts = [
+        Concept(subject_id=subject_id, position=i + 1, name=name, learned=False)
+        for i, name in enumerate(names)
     ]
+    db.add_all(concepts)
+    await db.commit()
+    # Concepts carry no user_id, so the dashboard hooks can't see them
+    dashboard_cache.invalidate(user_id)
     
-    # Flag the JSON field as modified
-    flag_modified(subject, 'subject_data')
-    db.commit()
-    db.refresh(subject)
-    
-    return {"concepts": subject.subject_data.get('concepts', [])}
+    return {"concepts": [ConceptResponse.model_validate(c) for c in concepts]}
 
 
-@router.put("/subjects/{subject_id}/concepts/{concept_id}/toggle")
+@router.put("/subjects/{subject_id}/concepts/{concept_id}/toggle", responses={409: {"description": "Subject version changed; body has the current subject"}})
 async def toggle_concept(
     subject_id: int,
     concept_id: int,
+    version: Optional[int] = Query(None, description="Subject version the change is based on; 409 if it has moved on"),
     user_id: int = Depends(get_current_user_id),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Toggle concept learned status."""
-    from sqlalchemy.orm.attributes import flag_modified
-    
-    subject = db.query(Subject).filter(
-        Subject.id == subject_id,
-        Subject.user_id == user_id
-    ).first()
-    
-    if not subject:
-        raise HTTPException(status_code=404, detail="Subject not found")
-    
-    if not subject.subject_data or 'concepts' not in subject.subject_data:
-        raise HTTPException(status_code=400, detail="No concepts found for this subject")
-    
-    # Toggle the concept
-    for concept in subject.subject_data['concepts']:
-        if concept['id'] == concept_id:
-            concept['learned'] = not concept.get('learned', False)
-            break
+    # Lock the subject before its concepts, in the same order as build_concepts,
+    # so concurrent toggles and regenerations can't deadlock
+    row = await claim_subject_version(db, subject_id, user_id, version)
+    if row is None:
+        return await subject_conflict(db, subject_id, user_id)
+    
+    # Flip the one concept row in place
+    result = await db.execute(
+        update(Concept)
+        .filter(Concept.id == concept_id, Concept.subject_id == subject_id)
+        .values(learned=~Concept.learned)
+        .execution_options(synchronize_session=False)
+    )
+    if not result.rowcount:
+        # Undo the version bump
+        await db.rollback()
+        raise HTTPException(status_code=404, detail="Concept not found")
     
     # Calculate progress: Each concept = 10% (5 concepts = 50%, documentation = 50%)
-    concepts = subject.subject_data.get('concepts', [])
-    learned_count = sum(1 for c in concepts if c.get('learned', False))
-    concept_progress = learned_count * 10  # 10% per concept, max 50%
-    
-    # Check if documentation was already submitted
-    has_documentation = subject.subject_data.get('documentation_submitted', False)
-    doc_progress = 50 if has_documentation else 0
-    
-    subject.progress = concept_progress + doc_progress
-    
-    # Flag the JSON field as modified for SQLAlchemy to detect changes
-    flag_modified(subject, 'subject_data')
-    db.commit()
+    learned_count = (
+        select(func.count(Concept.id))
+        .filter(Concept.subject_id == subject_id, Concept.learned.is_(True))
+        .scalar_subquery()
+    )
+    has_documentation = exists().where(Submission.subject_id == subject_id)
+    result = await db.execute(
+        update(Subject)
+        .filter(Subject.id == subject_id)
+        .values(progress=learned_count * 10 + case((has_documentation, 50), else_=0))
+        .returning(Subject.progress)
+        .execution_options(synchronize_session=False)
+    )
+    progress = result.scalar_one()
+    await db.commit()
+    # Core UPDATEs bypass the flush hooks that normally invalidate the dashboard
+    dashboard_cache.invalidate(user_id)
     
-    return {"message": "Concept toggled successfully", "progress": subject.progress}
+    return {"message": "Concept toggled successfully", "progress": progress, "version": row.version}
 
 
-@router.post("/subjects/{subject_id}/generate-task")
+@router.post("/subjects/{subject_id}/generate-task", responses={202: {"model": JobSubmittedResponse}})
 async def generate_project_task(
     subject_id: int,
+    background: bool = False,
+    idempotency_key: Optional[str] = Header(None, max_length=255),
     user_id: int = Depends(get_current_user_id),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Generate a project task covering all concepts of the subject."""
-    subject = db.query(Subject).filter(
+    """Generate a project task covering all concepts of the subject.
+    
+    Pass ``background=true`` to run as a job and poll ``/api/jobs/{job_id}``.
+    A repeated ``Idempotency-Key`` gets the first response back.
+    """
+    return await IdempotencyService.run(
+        user_id, idempotency_key, f"generate_task:{subject_id}",
+        lambda: run_or_enqueue(
+            background, db, user_id, "generate_task",
+            lambda job_db: build_project_task(job_db, user_id, subject_id)
+        )
+    )
+
+
+async def build_project_task(db: AsyncSession, user_id: int, subject_id: int) -> dict:
+    """Return the subject's saved task, generating and saving one if needed."""
+    result = await db.execute(select(Subject).filter(
         Subject.id == subject_id,
         Subject.user_id == user_id
-    ).first()
+    ))
+    subject = result.scalars().first()
     
     if not subject:
         raise HTTPException(status_code=404, detail="Subject not found")
     
-    # Initialize subject_data if needed
-    if not subject.subject_data:
-        subject.subject_data = {}
-    
     # Check if task already exists - return existing task
-    existing_task = subject.subject_data.get('generated_task')
-    if existing_task:
-        return {"task": existing_task, "is_existing": True}
+    if subject.generated_task:
+        return {"task": subject.generated_task, "is_existing": True}
     
     # Get concepts
-    concepts = subject.subject_data.get('concepts', []) if subject.subject_data else []
-    concept_names = [c['name'] for c in concepts]
+    result = await db.execute(
+        select(Concept.name).filter(Concept.subject_id == subject_id).order_by(Concept.position)
+    )
+    concept_names = result.scalars().all()
     
-    # Generate project task using AI
-    task = AcademicAgent.generate_project_task(subject.name, concept_names)
+    # Generate project task using AI; concurrent requests for the subject share one call
+    task = await generation_flights.run(
+        ("generate_task", subject_id),
+        lambda: AcademicAgent.generate_project_task(subject.name, concept_names)
+    )
     
-    # Save the generated task to database
-    subject.subject_data = {**subject.subject_data, 'generated_task': task}
-    flag_modified(subject, 'subject_data')
-    db.commit()
+    # Save the generated task to database, unless another worker saved one first
+    result = await db.execute(
+        update(Subject)
+        .filter(Subject.id == subject_id, Subject.generated_task.is_(None))
+        .values(generated_task=task)
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+    if not result.rowcount:
+        result = await db.execute(select(Subject.generated_task).filter(Subject.id == subject_id))
+        return {"task": result.scalar_one(), "is_existing": True}
     
     return {"task": task, "is_existing": False}
 
 
-@router.post("/subjects/submit-project")
+@router.post("/subjects/submit-project", responses={409: {"description": "Subject version changed; body has the current subject"}})
 async def submit_project(
     subject_id: int = Form(...),
     task: str = Form(...),
     github_link: Optional[str] = Form(None),
+    version: Optional[int] = Form(None),
     documentation: UploadFile = File(...),
     user_id: int = Depends(get_current_user_id),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Submit a project with documentation."""
     # Validate file type
@@ -356,36 +508,46 @@ async def submit_project(
             detail="Only PDF and DOCX files are allowed for documentation"
         )
     
-    # Save file (in production, upload to cloud storage)
-    file_location = f"uploads/{user_id}_{subject_id}_{documentation.filename}"
-    
     # Update subject metadata
-    subject = db.query(Subject).filter(
+    result = await db.execute(select(Subject).filter(
         Subject.id == subject_id,
         Subject.user_id == user_id
-    ).first()
+    ))
+    subject = result.scalars().first()
     
     if not subject:
         raise HTTPException(status_code=404, detail="Subject not found")
     
-    if not subject.subject_data:
-        subject.subject_data = {}
-    
-    if 'submissions' not in subject.subject_data:
-        subject.subject_data['submissions'] = []
+    # Stream the file to storage; identical documents are stored once. If the
+    # version check below fails the file stays stored but unreferenced.
+    stored = await save_upload(documentation)
     
-    # Mark documentation as submitted
-    subject.subject_data['documentation_submitted'] = True
-    subject.subject_data['submissions'].append({
-        'task': task,
-        'github_link': github_link,
-        'documentation': documentation.filename,
-        'submitted_at': datetime.now(timezone.utc).isoformat()
-    })
-    
-    # Update subject progress to 100% and status to completed
-    subject.progress = 100
-    subject.status = SubjectStatus.COMPLETED
+    # Update subject progress to 100% and status to completed, unless another
+    # request got there first
+    row = await claim_subject_version(
+        db, subject_id, user_id, version,
+        progress=100,
+        status=SubjectStatus.COMPLETED
+    )
+    if row is None:
+        return await subject_conflict(db, subject_id, user_id)
+    
+    # Record the submission; its existence marks the documentation as submitted
+    next_position = (
+        select(func.coalesce(func.max(Submission.position), 0) + 1)
+        .filter(Submission.subject_id == subject_id)
+        .scalar_subquery()
+    )
+    await db.execute(insert(Submission).values(
+        subject_id=subject_id,
+        position=next_position,
+        task=task,
+        github_link=github_link,
+        documentation=documentation.filename,
+        document_key=stored.key,
+        document_size=stored.size,
+        submitted_at=datetime.now(timezone.utc)
+    ))
     
     # Create a new project in the Projects table as completed
     new_project = Project(
@@ -402,14 +564,18 @@ async def submit_project(
     )
     db.add(new_project)
     
-    flag_modified(subject, 'subject_data')
-    db.commit()
-    db.refresh(new_project)
+    await db.commit()
+    await db.refresh(new_project)
+    # Core UPDATEs bypass the flush hooks that normally invalidate the dashboard
+    dashboard_cache.invalidate(user_id)
     
     return {
         "message": "Project submitted successfully",
         "subject_id": subject_id,
+        "version": row.version,
         "project_id": new_project.id,
-        "documentation": documentation.filename
+        "documentation": documentation.filename,
+        "document_sha256": stored.key,
+        "document_size": stored.size
     }
 
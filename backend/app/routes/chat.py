@@ -1,27 +1,24 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from sqlalchemy.orm.attributes import flag_modified
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel
 from typing import List, Optional
-from datetime import datetime, timedelta, timezone
-from database import get_db
+import anyio
+from datetime import datetime, timezone
+import json
+import logging
+from config import settings
+from database import get_async_db, AsyncSessionLocal
 from app.models.chat import ChatSession, ChatMessage
 from app.utils.auth import get_current_user_id
-import os
-from dotenv import load_dotenv
-from openai import OpenAI
+from app.agents.llm_gateway import llm_gateway
+from app.services.chat_summary_service import chat_summarizer
 
-# Load environment variables
-load_dotenv()
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/chat", tags=["chat"])
 
-# Initialize Groq client
-client = OpenAI(
-    api_key=os.getenv("OPENAI_API_KEY"),
-    base_url="https://api.groq.com/openai/v1"
-)
-
 # EduPilot System Prompt - Restricts bot to platform-related queries only
 EDUBOT_SYSTEM_PROMPT = """You are EduBot, the official AI assistant for EduPilot - an AI-powered career development platform for university students.
 
@@ -78,6 +75,8 @@ COMMON QUESTIONS:
 
 Always be helpful and guide users to get the most out of EduPilot! 🚀"""
 
+FALLBACK_REPLY = "I'm having trouble connecting right now. Please try again in a moment! 🔄"
+
 
 class ChatRequest(BaseModel):
     message: str
@@ -95,7 +94,8 @@ class ChatMessageResponse(BaseModel):
 
 class ChatSessionResponse(BaseModel):
     id: int
-    messages: List[ChatMessageResponse]
+    messages: List[ChatMessageResponse]  # Most recent page, oldest first
+    has_more: bool = False  # Older messages are available from /api/chat/messages
     created_at: datetime
     updated_at: Optional[datetime]
 
@@ -103,130 +103,229 @@ class ChatSessionResponse(BaseModel):
         from_attributes = True
 
 
-def cleanup_old_messages(db: Session, user_id: int):
-    """Delete chat messages older than 7 days."""
-    seven_days_ago = datetime.now(timezone.utc) - timedelta(days=7)
-    
-    # Get old sessions
-    old_sessions = db.query(ChatSession).filter(
-        ChatSession.user_id == user_id,
-        ChatSession.created_at < seven_days_ago
-    ).all()
-    
-    # Delete old sessions (messages will cascade delete)
-    for session in old_sessions:
-        db.delete(session)
-    
-    db.commit()
+class ChatMessagePage(BaseModel):
+    messages: List[ChatMessageResponse]  # Oldest first
+    has_more: bool
+    next_before: Optional[int]  # Pass as ?before= to fetch the previous page
 
 
-@router.get("/session", response_model=Optional[ChatSessionResponse])
-async def get_or_create_session(
-    user_id: int = Depends(get_current_user_id),
-    db: Session = Depends(get_db)
-):
-    """Get the user's active chat session or create a new one."""
-    # Cleanup old messages first
-    cleanup_old_messages(db, user_id)
-    
-    # Get the most recent session
-    session = db.query(ChatSession).filter(
+async def find_latest_session(db: AsyncSession, user_id: int) -> Optional[ChatSession]:
+    """Return the user's most recent chat session, if any."""
+    result = await db.execute(select(ChatSession).filter(
         ChatSession.user_id == user_id
-    ).order_by(ChatSession.created_at.desc()).first()
+    ).order_by(ChatSession.created_at.desc()))
+    return result.scalars().first()
+
+
+async def get_latest_session(db: AsyncSession, user_id: int) -> ChatSession:
+    """Return the user's most recent chat session, creating one if needed."""
+    session = await find_latest_session(db, user_id)
     
     if not session:
-        # Create new session
         session = ChatSession(user_id=user_id)
         db.add(session)
-        db.commit()
-        db.refresh(session)
+        await db.commit()
+        await db.refresh(session)
     
     return session
 
 
-@router.post("/message", response_model=ChatMessageResponse)
-async def send_message(
-    request: ChatRequest,
+async def fetch_message_page(
+    db: AsyncSession,
+    session_id: int,
+    before: Optional[int] = None,
+    limit: int = settings.CHAT_PAGE_SIZE
+) -> ChatMessagePage:
+    """Keyset page of a session's messages with ids below ``before`` (newest page by default)."""
+    query = select(ChatMessage).filter(ChatMessage.session_id == session_id)
+    if before is not None:
+        query = query.filter(ChatMessage.id < before)
+    
+    # One extra row tells us whether an older page exists
+    result = await db.execute(query.order_by(ChatMessage.id.desc()).limit(limit + 1))
+    rows = result.scalars().all()
+    page = list(reversed(rows[:limit]))
+    has_more = len(rows) > limit
+    
+    return ChatMessagePage(
+        messages=[ChatMessageResponse.model_validate(msg) for msg in page],
+        has_more=has_more,
+        next_before=page[0].id if has_more else None
+    )
+
+
+@router.get("/session", response_model=ChatSessionResponse)
+async def get_or_create_session(
     user_id: int = Depends(get_current_user_id),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Send a message to EduBot and get a response."""
-    # Get or create session
-    session = db.query(ChatSession).filter(
-        ChatSession.user_id == user_id
-    ).order_by(ChatSession.created_at.desc()).first()
+    """Get the user's active chat session (with its latest messages) or create a new one."""
+    session = await get_latest_session(db, user_id)
+    page = await fetch_message_page(db, session.id)
     
-    if not session:
-        session = ChatSession(user_id=user_id)
-        db.add(session)
-        db.commit()
-        db.refresh(session)
+    return ChatSessionResponse(
+        id=session.id,
+        messages=page.messages,
+        has_more=page.has_more,
+        created_at=session.created_at,
+        updated_at=session.updated_at
+    )
+
+
+@router.get("/messages", response_model=ChatMessagePage)
+async def get_messages(
+    before: Optional[int] = Query(None, description="Return messages older than this message id"),
+    limit: int = Query(settings.CHAT_PAGE_SIZE, ge=1, le=100),
+    session_id: Optional[int] = Query(None, description="Defaults to the latest session"),
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Page backwards through a chat session's history."""
+    if session_id is None:
+        session = await find_latest_session(db, user_id)
+        if not session:
+            return ChatMessagePage(messages=[], has_more=False, next_before=None)
+    else:
+        result = await db.execute(select(ChatSession).filter(
+            ChatSession.id == session_id,
+            ChatSession.user_id == user_id
+        ))
+        session = result.scalars().first()
+        if not session:
+            raise HTTPException(status_code=404, detail="Chat session not found")
     
-    # Save user message
+    return await fetch_message_page(db, session.id, before, limit)
+
+
+async def record_user_message(db: AsyncSession, session: ChatSession, content: str) -> List[dict]:
+    """Persist the user's message and build the prompt for the model."""
     user_message = ChatMessage(
         session_id=session.id,
         role="user",
-        content=request.message
+        content=content
     )
     db.add(user_message)
-    db.commit()
+    await db.commit()
+    
+    return await chat_summarizer.build_prompt(db, session, EDUBOT_SYSTEM_PROMPT)
+
+
+async def save_assistant_message(db: AsyncSession, session_id: int, content: str) -> ChatMessage:
+    """Persist the assistant's reply and bump the session timestamp."""
+    assistant_message = ChatMessage(
+        session_id=session_id,
+        role="assistant",
+        content=content
+    )
+    db.add(assistant_message)
     
-    # Get conversation history (last 10 messages for context)
-    recent_messages = db.query(ChatMessage).filter(
-        ChatMessage.session_id == session.id
-    ).order_by(ChatMessage.created_at.desc()).limit(10).all()
+    # Update session timestamp
+    await db.execute(
+        update(ChatSession)
+        .filter(ChatSession.id == session_id)
+        .values(updated_at=datetime.now(timezone.utc))
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+    await db.refresh(assistant_message)
     
-    # Reverse to get chronological order
-    recent_messages = list(reversed(recent_messages))
+    await chat_summarizer.maybe_refresh(db, session_id)
     
-    # Build messages for API
-    messages = [{"role": "system", "content": EDUBOT_SYSTEM_PROMPT}]
-    for msg in recent_messages:
-        messages.append({"role": msg.role, "content": msg.content})
+    return assistant_message
+
+
+def sse_event(data: dict, event: Optional[str] = None) -> str:
+    """Format a server-sent event frame."""
+    frame = f"event: {event}\n" if event else ""
+    return frame + f"data: {json.dumps(data)}\n\n"
+
+
+@router.post("/message", response_model=ChatMessageResponse)
+async def send_message(
+    request: ChatRequest,
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Send a message to EduBot and get a response."""
+    session = await get_latest_session(db, user_id)
+    messages = await record_user_message(db, session, request.message)
     
     try:
         # Call Groq API
-        response = client.chat.completions.create(
-            model="llama-3.1-8b-instant",
+        assistant_content = await llm_gateway.complete(
             messages=messages,
             temperature=0.7,
             max_tokens=500
         )
-        
-        assistant_content = response.choices[0].message.content
-    except Exception as e:
-        print(f"Groq API error: {e}")
-        assistant_content = "I'm having trouble connecting right now. Please try again in a moment! 🔄"
+    except Exception:
+        logger.exception("LLM completion error")
+        assistant_content = FALLBACK_REPLY
     
-    # Save assistant message
-    assistant_message = ChatMessage(
-        session_id=session.id,
-        role="assistant",
-        content=assistant_content
-    )
-    db.add(assistant_message)
+    return await save_assistant_message(db, session.id, assistant_content)
+
+
+@router.post("/message/stream")
+async def stream_message(
+    request: ChatRequest,
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Send a message to EduBot and stream the reply as server-sent events.
     
-    # Update session timestamp
-    session.updated_at = datetime.now(timezone.utc)
-    db.commit()
-    db.refresh(assistant_message)
+    Emits ``data: {"delta": "..."}`` frames as tokens arrive, then a final
+    ``event: done`` frame carrying the saved message. The reply is persisted
+    even if the client disconnects mid-stream.
+    """
+    session = await get_latest_session(db, user_id)
+    session_id = session.id
+    messages = await record_user_message(db, session, request.message)
     
-    return assistant_message
+    async def event_stream():
+        parts = []
+        completed = False
+        try:
+            try:
+                async for delta in llm_gateway.stream(messages, temperature=0.7, max_tokens=500):
+                    parts.append(delta)
+                    yield sse_event({"delta": delta})
+            except Exception:
+                logger.exception("LLM streaming error")
+                if not parts:
+                    parts.append(FALLBACK_REPLY)
+                    yield sse_event({"delta": FALLBACK_REPLY})
+            completed = True
+        finally:
+            # The request-scoped session is already closed once streaming starts,
+            # and the save must survive the cancellation caused by a disconnect
+            content = "".join(parts)
+            saved = None
+            if content:
+                with anyio.CancelScope(shield=True):
+                    async with AsyncSessionLocal() as stream_db:
+                        saved = await save_assistant_message(stream_db, session_id, content)
+                        saved = ChatMessageResponse.model_validate(saved)
+            if completed and saved is not None:
+                yield sse_event(json.loads(saved.model_dump_json()), event="done")
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 
 @router.delete("/clear")
 async def clear_chat(
     user_id: int = Depends(get_current_user_id),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Clear all chat history for the user."""
-    sessions = db.query(ChatSession).filter(
-        ChatSession.user_id == user_id
-    ).all()
-    
-    for session in sessions:
-        db.delete(session)
-    
-    db.commit()
+    # One statement; messages go with their sessions via ON DELETE CASCADE
+    await db.execute(
+        delete(ChatSession)
+        .filter(ChatSession.user_id == user_id)
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
     
     return {"message": "Chat history cleared"}
@@ -1,14 +1,18 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Body, Depends, HTTPException, Path, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional, Dict, Any
 from pydantic import BaseModel
-from database import get_db
-from app.utils.auth import get_current_user_id
+from database import get_async_db
+from app.utils.auth import get_current_user, get_current_user_id
 from app.models.cv import CV
 from app.models.project import Project
 from app.models.academic import Skill
-from app.models.user import User
+from app.schemas.user import UserResponse
 from app.agents.academic_agent import AcademicAgent
+from app.schemas.job import JobSubmittedResponse
+from app.services.job_service import run_or_enqueue
+from app.services.cv_service import CVService, CVSection
 from datetime import datetime
 
 router = APIRouter()
@@ -40,19 +44,17 @@ class CVGenerateRequest(BaseModel):
 @router.get("/current")
 async def get_current_cv(
     user_id: int = Depends(get_current_user_id),
-    db: Session = Depends(get_db)
+    user: UserResponse = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get user's current CV or generate from user profile data"""
     # First check if user has a saved CV
-    cv = db.query(CV).filter(CV.user_id == user_id).order_by(CV.updated_at.desc()).first()
-    
-    # Get user data
-    user = db.query(User).filter(User.id == user_id).first()
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
+    result = await db.execute(select(CV).filter(CV.user_id == user_id).order_by(CV.updated_at.desc()))
+    cv = result.scalars().first()
     
     # Get user's projects
-    projects = db.query(Project).filter(Project.user_id == user_id).all()
+    result = await db.execute(select(Project).filter(Project.user_id == user_id))
+    projects = result.scalars().all()
     projects_list = [
         {
             "title": p.title,
@@ -65,7 +67,8 @@ async def get_current_cv(
     ]
     
     # Get user's skills
-    skills = db.query(Skill).filter(Skill.user_id == user_id).all()
+    result = await db.execute(select(Skill).filter(Skill.user_id == user_id))
+    skills = result.scalars().all()
     skills_list = [s.name for s in skills if s.name]
     
     if cv:
@@ -137,21 +140,20 @@ async def get_current_cv(
 @router.post("/generate")
 async def generate_cv(
     user_id: int = Depends(get_current_user_id),
-    db: Session = Depends(get_db)
+    user: UserResponse = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Generate CV from user's projects and skills"""
-    user = db.query(User).filter(User.id == user_id).first()
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-    
     # Get user's completed projects
-    completed_projects = db.query(Project).filter(
+    result = await db.execute(select(Project).filter(
         Project.user_id == user_id,
         Project.status == "completed"
-    ).all()
+    ))
+    completed_projects = result.scalars().all()
     
     # Get user's skills
-    skills = db.query(Skill).filter(Skill.user_id == user_id).all()
+    result = await db.execute(select(Skill).filter(Skill.user_id == user_id))
+    skills = result.scalars().all()
     
     # Prepare CV data
     projects_list = [
@@ -174,7 +176,8 @@ async def generate_cv(
     ]
     
     # Check if CV exists
-    existing_cv = db.query(CV).filter(CV.user_id == user_id).first()
+    result = await db.execute(select(CV).filter(CV.user_id == user_id))
+    existing_cv = result.scalars().first()
     
     cv_data = {
         "user_id": user_id,
@@ -193,30 +196,28 @@ async def generate_cv(
         # Update existing CV
         for key, value in cv_data.items():
             setattr(existing_cv, key, value)
-        db.commit()
-        db.refresh(existing_cv)
+        await db.commit()
+        await db.refresh(existing_cv)
         return existing_cv
     else:
         # Create new CV
         cv = CV(**cv_data)
         db.add(cv)
-        db.commit()
-        db.refresh(cv)
+        await db.commit()
+        await db.refresh(cv)
         return cv
 
 @router.post("/save")
 async def save_cv(
     cv_data: CVSaveRequest,
     user_id: int = Depends(get_current_user_id),
-    db: Session = Depends(get_db)
+    user: UserResponse = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Save or update user's CV profile data"""
-    user = db.query(User).filter(User.id == user_id).first()
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-    
     # Check if CV exists
-    existing_cv = db.query(CV).filter(CV.user_id == user_id).first()
+    result = await db.execute(select(CV).filter(CV.user_id == user_id))
+    existing_cv = result.scalars().first()
     
     # Prepare CV data dictionary
     cv_dict = {
@@ -244,24 +245,50 @@ async def save_cv(
         for key, value in cv_dict.items():
             if key != "user_id":  # Don't update user_id
                 setattr(existing_cv, key, value)
-        db.commit()
-        db.refresh(existing_cv)
+        await db.commit()
+        await db.refresh(existing_cv)
         return existing_cv
     else:
         # Create new CV
         new_cv = CV(**cv_dict)
         db.add(new_cv)
-        db.commit()
-        db.refresh(new_cv)
+        await db.commit()
+        await db.refresh(new_cv)
         return new_cv
 
+@router.post("/sections/{section}", status_code=status.HTTP_201_CREATED)
+async def add_cv_entry(
+    section: CVSection,
+    entry: Dict[str, Any] = Body(...),
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Append one entry to a CV section without resending the whole CV"""
+    index = await CVService.append_entry(db, user_id, section, entry)
+    return {"section": section, "index": index}
+
+@router.patch("/sections/{section}/{index}")
+async def update_cv_entry(
+    section: CVSection,
+    index: int = Path(..., ge=0),
+    changes: Dict[str, Any] = Body(...),
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Update fields of one CV section entry in place"""
+    if not changes:
+        raise HTTPException(status_code=400, detail="No fields to update")
+    await CVService.update_entry(db, user_id, section, index, changes)
+    return {"section": section, "index": index}
+
 @router.get("/download")
 async def download_cv(
     user_id: int = Depends(get_current_user_id),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Download CV as formatted document"""
-    cv = db.query(CV).filter(CV.user_id == user_id).order_by(CV.updated_at.desc()).first()
+    result = await db.execute(select(CV).filter(CV.user_id == user_id).order_by(CV.updated_at.desc()))
+    cv = result.scalars().first()
     if not cv:
         raise HTTPException(status_code=404, detail="No CV found. Generate one first.")
     
@@ -272,20 +299,27 @@ async def download_cv(
         "cv_data": cv
     }
 
-@router.post("/generate-formatted")
+@router.post("/generate-formatted", responses={202: {"model": JobSubmittedResponse}})
 async def generate_formatted_cv(
     request: CVGenerateRequest,
+    background: bool = False,
     user_id: int = Depends(get_current_user_id),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Generate a formatted CV using AI based on selected format"""
+    """Generate a formatted CV using AI based on selected format.
+    
+    Pass ``background=true`` to run as a job and poll ``/api/jobs/{job_id}``.
+    """
     cv_data = request.cvData
     format_type = request.format
     
-    # Generate formatted CV using AI
-    formatted_cv = academic_agent.generate_formatted_cv(cv_data, format_type)
+    async def build_formatted_cv(job_db: AsyncSession):
+        # Generate formatted CV using AI
+        formatted_cv = await academic_agent.generate_formatted_cv(cv_data, format_type)
+        
+        return {
+            "formatted_cv": formatted_cv,
+            "format": format_type
+        }
     
-    return {
-        "formatted_cv": formatted_cv,
-        "format": format_type
-    }
+    return await run_or_enqueue(background, db, user_id, "generate_formatted_cv", build_formatted_cv)
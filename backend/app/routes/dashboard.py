@@ -0,0 +1,17 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from database import get_async_db
+from app.schemas.dashboard import DashboardSummaryResponse
+from app.services.dashboard_service import DashboardService
+from app.utils.auth import get_current_user_id
+
+router = APIRouter()
+
+
+@router.get("/summary", response_model=DashboardSummaryResponse)
+async def get_dashboard_summary(
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Counts, progress and top items for every dashboard card in one request."""
+    return await DashboardService.get_summary(db, user_id)
@@ -1,11 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
-from database import get_db
-from app.utils.auth import get_current_user_id
+from database import get_async_db
+from app.utils.auth import get_current_user, get_current_user_id
+from app.utils.listing import ListParams, paginate
 from app.models.cv import Opportunity
 from app.models.academic import Skill
-from app.models.user import User
+from app.schemas.user import UserResponse
 from datetime import datetime
 import httpx
 import os
@@ -68,28 +70,36 @@ async def get_findwork_jobs(
 
 @router.get("")
 async def get_opportunities(
+    response: Response,
+    type: Optional[str] = None,
+    applied: Optional[bool] = None,
+    params: ListParams = Depends(),
     user_id: int = Depends(get_current_user_id),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Get all opportunities for the user"""
-    opportunities = db.query(Opportunity).filter(
-        Opportunity.user_id == user_id
-    ).order_by(Opportunity.match_score.desc()).all()
+    """Get opportunities for the user, best matches first"""
+    query = select(Opportunity).filter(Opportunity.user_id == user_id)
+    if type:
+        query = query.filter(Opportunity.type == type)
+    if applied is not None:
+        query = query.filter(Opportunity.applied == applied)
     
-    return opportunities
+    # /match always sets match_score, so the keyset never compares NULLs
+    return await paginate(
+        db, query, Opportunity, params, response,
+        order_by=[Opportunity.match_score, Opportunity.id], descending=True
+    )
 
 @router.post("/match")
 async def match_opportunities(
     user_id: int = Depends(get_current_user_id),
-    db: Session = Depends(get_db)
+    user: UserResponse = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """AI-powered opportunity matching based on user skills"""
-    user = db.query(User).filter(User.id == user_id).first()
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-    
     # Get user's skills
-    skills = db.query(Skill).filter(Skill.user_id == user_id).all()
+    result = await db.execute(select(Skill).filter(Skill.user_id == user_id))
+    skills = result.scalars().all()
     
     if not skills:
         raise HTTPException(
@@ -147,7 +157,7 @@ async def match_opportunities(
     ]
     
     # Clear existing opportunities
-    db.query(Opportunity).filter(Opportunity.user_id == user_id).delete()
+    await db.execute(delete(Opportunity).filter(Opportunity.user_id == user_id))
     
     # Create new opportunities
     created_opportunities = []
@@ -159,11 +169,11 @@ async def match_opportunities(
         db.add(opportunity)
         created_opportunities.append(opportunity)
     
-    db.commit()
+    await db.commit()
     
     # Refresh to get IDs
     for opp in created_opportunities:
-        db.refresh(opp)
+        await db.refresh(opp)
     
     return {
         "message": f"Found {len(created_opportunities)} matching opportunities",
@@ -174,19 +184,20 @@ async def match_opportunities(
 async def mark_as_applied(
     opportunity_id: int,
     user_id: int = Depends(get_current_user_id),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Mark opportunity as applied"""
-    opportunity = db.query(Opportunity).filter(
+    result = await db.execute(select(Opportunity).filter(
         Opportunity.id == opportunity_id,
         Opportunity.user_id == user_id
-    ).first()
+    ))
+    opportunity = result.scalars().first()
     
     if not opportunity:
         raise HTTPException(status_code=404, detail="Opportunity not found")
     
     opportunity.applied = True
-    db.commit()
-    db.refresh(opportunity)
+    await db.commit()
+    await db.refresh(opportunity)
     
     return opportunity
@@ -1,17 +1,21 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
-from database import get_db
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from typing import List, Optional
+from database import get_async_db
 from app.schemas.project import (
     ProjectCreate, ProjectResponse, ProjectUpdate, ProjectGenerateRequest,
     MilestoneCreate, MilestoneResponse
 )
+from app.schemas.job import JobSubmittedResponse
 from app.models.project import Project, Milestone, ProjectStatus
 from app.models.academic import Subject
 from app.models.cv import CV
-from app.models.user import User
-from app.utils.auth import get_current_user_id
+from app.utils.auth import get_current_user_id, load_user_profile
+from app.utils.listing import ListParams, paginate
 from app.agents.project_agent import ProjectAgent
+from app.services.job_service import run_or_enqueue
 import json
 from datetime import datetime
 
@@ -20,19 +24,25 @@ router = APIRouter()
 
 @router.get("", response_model=List[ProjectResponse])
 async def get_projects(
+    response: Response,
+    project_status: Optional[ProjectStatus] = Query(None, alias="status"),
+    params: ListParams = Depends(),
     user_id: int = Depends(get_current_user_id),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Get all projects for current user."""
-    projects = db.query(Project).filter(Project.user_id == user_id).all()
-    return projects
+    """Get projects for current user, optionally filtered and paginated."""
+    query = select(Project).filter(Project.user_id == user_id)
+    if project_status:
+        query = query.filter(Project.status == project_status)
+    
+    return await paginate(db, query, Project, params, response, order_by=[Project.id], schema=ProjectResponse)
 
 
 @router.post("", response_model=ProjectResponse, status_code=status.HTTP_201_CREATED)
 async def create_project(
     project_data: ProjectCreate,
     user_id: int = Depends(get_current_user_id),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create a new project manually."""
     project = Project(
@@ -49,29 +59,42 @@ async def create_project(
         completion_percentage=0
     )
     db.add(project)
-    db.commit()
-    db.refresh(project)
+    await db.commit()
+    await db.refresh(project)
     return project
 
 
-@router.post("/generate", response_model=ProjectResponse, status_code=status.HTTP_201_CREATED)
+@router.post("/generate", response_model=ProjectResponse, status_code=status.HTTP_201_CREATED, responses={202: {"model": JobSubmittedResponse}})
 async def generate_project(
     request: ProjectGenerateRequest,
+    background: bool = False,
     user_id: int = Depends(get_current_user_id),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """AI-generate a project based on a subject."""
+    """AI-generate a project based on a subject.
+    
+    Pass ``background=true`` to run as a job and poll ``/api/jobs/{job_id}``.
+    """
+    return await run_or_enqueue(
+        background, db, user_id, "generate_project",
+        lambda job_db: build_generated_project(job_db, user_id, request.subject_id)
+    )
+
+
+async def build_generated_project(db: AsyncSession, user_id: int, subject_id: int) -> ProjectResponse:
+    """Generate a project for the subject with the LLM and save it."""
     # Get the subject
-    subject = db.query(Subject).filter(
-        Subject.id == request.subject_id,
+    result = await db.execute(select(Subject).filter(
+        Subject.id == subject_id,
         Subject.user_id == user_id
-    ).first()
+    ))
+    subject = result.scalars().first()
     
     if not subject:
         raise HTTPException(status_code=404, detail="Subject not found")
     
     # Generate project using AI
-    generated = ProjectAgent.generate_project(
+    generated = await ProjectAgent.generate_project(
         subject_name=subject.name,
         subject_description=subject.description,
         difficulty="Intermediate"
@@ -92,22 +115,23 @@ async def generate_project(
         completion_percentage=0
     )
     db.add(project)
-    db.commit()
-    db.refresh(project)
-    return project
+    await db.commit()
+    await db.refresh(project)
+    return ProjectResponse.model_validate(project)
 
 
 @router.get("/{project_id}", response_model=ProjectResponse)
 async def get_project(
     project_id: int,
     user_id: int = Depends(get_current_user_id),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get a specific project."""
-    project = db.query(Project).filter(
+    result = await db.execute(select(Project).filter(
         Project.id == project_id,
         Project.user_id == user_id
-    ).first()
+    ))
+    project = result.scalars().first()
     
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
@@ -120,13 +144,14 @@ async def update_project(
     project_id: int,
     project_data: ProjectUpdate,
     user_id: int = Depends(get_current_user_id),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update a project."""
-    project = db.query(Project).filter(
+    result = await db.execute(select(Project).filter(
         Project.id == project_id,
         Project.user_id == user_id
-    ).first()
+    ))
+    project = result.scalars().first()
     
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
@@ -134,24 +159,26 @@ async def update_project(
     old_status = project.status
     
     # Update fields
-    update_data = project_data.dict(exclude_unset=True)
+    update_data = project_data.model_dump(exclude_unset=True)
     for key, value in update_data.items():
         setattr(project, key, value)
     
     # Auto-update CV when project is marked as completed
     if old_status != "completed" and project.status == "completed":
         # Get user
-        user = db.query(User).filter(User.id == user_id).first()
+        user = await load_user_profile(db, user_id)
         
         # Get all completed projects
-        completed_projects = db.query(Project).filter(
+        result = await db.execute(select(Project).filter(
             Project.user_id == user_id,
             Project.status == "completed"
-        ).all()
+        ))
+        completed_projects = result.scalars().all()
         
         # Get user's skills
         from app.models.academic import Skill
-        skills = db.query(Skill).filter(Skill.user_id == user_id).all()
+        result = await db.execute(select(Skill).filter(Skill.user_id == user_id))
+        skills = result.scalars().all()
         
         # Prepare CV data
         projects_list = [
@@ -174,7 +201,8 @@ async def update_project(
         ]
         
         # Update or create CV
-        cv = db.query(CV).filter(CV.user_id == user_id).first()
+        result = await db.execute(select(CV).filter(CV.user_id == user_id))
+        cv = result.scalars().first()
         if cv:
             cv.projects = projects_list
             cv.skills = skills_list
@@ -193,8 +221,8 @@ async def update_project(
             )
             db.add(cv)
     
-    db.commit()
-    db.refresh(project)
+    await db.commit()
+    await db.refresh(project)
     return project
 
 
@@ -202,19 +230,21 @@ async def update_project(
 async def delete_project(
     project_id: int,
     user_id: int = Depends(get_current_user_id),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Delete a project."""
-    project = db.query(Project).filter(
+    # Milestones keep a reference to the project, so load them for the ORM to unlink
+    result = await db.execute(select(Project).options(selectinload(Project.milestones)).filter(
         Project.id == project_id,
         Project.user_id == user_id
-    ).first()
+    ))
+    project = result.scalars().first()
     
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
     
-    db.delete(project)
-    db.commit()
+    await db.delete(project)
+    await db.commit()
     return None
 
 
@@ -222,19 +252,21 @@ async def delete_project(
 async def get_project_milestones(
     project_id: int,
     user_id: int = Depends(get_current_user_id),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get all milestones for a project."""
     # Verify project ownership
-    project = db.query(Project).filter(
+    result = await db.execute(select(Project).filter(
         Project.id == project_id,
         Project.user_id == user_id
-    ).first()
+    ))
+    project = result.scalars().first()
     
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
     
-    milestones = db.query(Milestone).filter(Milestone.project_id == project_id).all()
+    result = await db.execute(select(Milestone).filter(Milestone.project_id == project_id))
+    milestones = result.scalars().all()
     return milestones
 
 
@@ -243,14 +275,15 @@ async def create_milestone(
     project_id: int,
     milestone_data: MilestoneCreate,
     user_id: int = Depends(get_current_user_id),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Add a milestone to a project."""
     # Verify project ownership
-    project = db.query(Project).filter(
+    result = await db.execute(select(Project).filter(
         Project.id == project_id,
         Project.user_id == user_id
-    ).first()
+    ))
+    project = result.scalars().first()
     
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
@@ -264,6 +297,6 @@ async def create_milestone(
         is_completed=False
     )
     db.add(milestone)
-    db.commit()
-    db.refresh(milestone)
+    await db.commit()
+    await db.refresh(milestone)
     return milestone
@@ -0,0 +1,74 @@
+from pydantic import BaseModel
+from typing import Dict, List, Optional
+from datetime import datetime
+
+
+class DashboardSubject(BaseModel):
+    id: int
+    name: str
+    code: Optional[str]
+    status: Optional[str]
+    progress: Optional[int]
+
+
+class DashboardSkill(BaseModel):
+    id: int
+    name: str
+    category: Optional[str]
+    proficiency_level: Optional[float]
+
+
+class DashboardProject(BaseModel):
+    id: int
+    title: str
+    status: Optional[str]
+    completion_percentage: Optional[int]
+
+
+class DashboardOpportunity(BaseModel):
+    id: int
+    title: str
+    company: Optional[str]
+    match_score: Optional[float]
+    applied: Optional[bool]
+
+
+class SubjectSummary(BaseModel):
+    total: int
+    by_status: Dict[str, int]
+    average_progress: float
+    concepts_learned: int
+    concepts_total: int
+    recent: List[DashboardSubject]
+
+
+class SkillSummary(BaseModel):
+    total: int
+    average_proficiency: float
+    top: List[DashboardSkill]
+
+
+class ProjectSummary(BaseModel):
+    total: int
+    by_status: Dict[str, int]
+    average_completion: float
+    recent: List[DashboardProject]
+
+
+class OpportunitySummary(BaseModel):
+    total: int
+    applied: int
+    top: List[DashboardOpportunity]
+
+
+class CVSummary(BaseModel):
+    exists: bool
+    updated_at: Optional[datetime]
+
+
+class DashboardSummaryResponse(BaseModel):
+    subjects: SubjectSummary
+    skills: SkillSummary
+    projects: ProjectSummary
+    opportunities: OpportunitySummary
+    cv: CVSummary
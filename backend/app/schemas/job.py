@@ -0,0 +1,22 @@
+from pydantic import BaseModel
+from typing import Any, Optional
+from datetime import datetime
+
+
+class JobSubmittedResponse(BaseModel):
+    job_id: str
+    status: str
+
+
+class JobResponse(BaseModel):
+    id: str
+    kind: str
+    status: str
+    result: Optional[Any] = None
+    error: Optional[str] = None
+    created_at: Optional[datetime]
+    started_at: Optional[datetime]
+    finished_at: Optional[datetime]
+    
+    class Config:
+        from_attributes = True
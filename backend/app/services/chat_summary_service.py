@@ -0,0 +1,132 @@
+import asyncio
+import logging
+from typing import Dict, List
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from config import settings
+from database import AsyncSessionLocal
+from app.models.chat import ChatSession, ChatMessage
+from app.agents.llm_gateway import llm_gateway
+from app.utils.tokens import count_message_tokens, count_tokens, MESSAGE_OVERHEAD_TOKENS
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_SYSTEM_PROMPT = """You maintain a running summary of a conversation between a student and EduBot, the EduPilot assistant.
+Merge the existing summary with the new messages into one concise summary in plain prose.
+Keep the student's goals, questions, stated preferences and any answers or steps EduBot gave that later turns may refer to.
+Drop greetings and small talk. Reply with the summary only."""
+
+
+class ChatSummarizer:
+    """Keeps a rolling summary of each chat session's older messages.
+
+    Once a session's unsummarised history grows past
+    ``CHAT_SUMMARY_TRIGGER_TOKENS``, everything but the last few messages is
+    folded into ``ChatSession.summary`` in the background, so prompts stay
+    bounded without dropping earlier context.
+    """
+
+    def __init__(self):
+        self._tasks = set()
+        self._in_flight = set()
+
+    @staticmethod
+    def _unsummarized(session_id: int):
+        mark = select(ChatSession.summary_message_id).filter(ChatSession.id == session_id).scalar_subquery()
+        return select(ChatMessage).filter(
+            ChatMessage.session_id == session_id,
+            ChatMessage.id > func.coalesce(mark, 0)
+        )
+
+    async def build_prompt(self, db: AsyncSession, session: ChatSession, system_prompt: str) -> List[Dict[str, str]]:
+        """System prompt + summary + as many recent messages as fit the token budget."""
+        messages = [{"role": "system", "content": system_prompt}]
+        if session.summary:
+            messages.append({"role": "system", "content": f"Summary of the earlier conversation:\n{session.summary}"})
+        used = count_message_tokens(messages)
+        
+        result = await db.execute(
+            self._unsummarized(session.id)
+            .order_by(ChatMessage.created_at.desc(), ChatMessage.id.desc())
+            .limit(settings.CHAT_HISTORY_MAX_MESSAGES)
+        )
+        
+        # Walk back from the newest message; the latest one is always sent
+        history = []
+        for msg in result.scalars():
+            cost = count_tokens(msg.content) + MESSAGE_OVERHEAD_TOKENS
+            if history and used + cost > settings.CHAT_PROMPT_TOKEN_BUDGET:
+                break
+            history.append({"role": msg.role, "content": msg.content})
+            used += cost
+        
+        messages.extend(reversed(history))
+        return messages
+
+    async def maybe_refresh(self, db: AsyncSession, session_id: int):
+        """Schedule a summary refresh if the unsummarised history is over the threshold."""
+        if session_id in self._in_flight:
+            return
+        
+        result = await db.execute(self._unsummarized(session_id).with_only_columns(ChatMessage.content))
+        total = sum(count_tokens(content) + MESSAGE_OVERHEAD_TOKENS for content in result.scalars())
+        if total <= settings.CHAT_SUMMARY_TRIGGER_TOKENS:
+            return
+        
+        self._in_flight.add(session_id)
+        task = asyncio.create_task(self._refresh(session_id))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _refresh(self, session_id: int):
+        try:
+            async with AsyncSessionLocal() as db:
+                await self.refresh(db, session_id)
+        except Exception:
+            logger.exception("Chat summary refresh failed for session %s", session_id)
+        finally:
+            self._in_flight.discard(session_id)
+
+    async def refresh(self, db: AsyncSession, session_id: int):
+        """Fold all but the most recent messages into the session summary."""
+        session = await db.get(ChatSession, session_id)
+        if session is None:
+            return
+        
+        result = await db.execute(
+            self._unsummarized(session_id).order_by(ChatMessage.created_at, ChatMessage.id)
+        )
+        messages = result.scalars().all()
+        to_fold = messages[:-settings.CHAT_SUMMARY_KEEP_MESSAGES] if settings.CHAT_SUMMARY_KEEP_MESSAGES else messages
+        if not to_fold:
+            return
+        
+        transcript = "\n".join(f"{msg.role}: {msg.content}" for msg in to_fold)
+        summary = await llm_gateway.complete(
+            messages=[
+                {"role": "system", "content": SUMMARY_SYSTEM_PROMPT},
+                {"role": "user", "content": f"Existing summary:\n{session.summary or '(none)'}\n\nNew messages:\n{transcript}"}
+            ],
+            temperature=0.2,
+            max_tokens=settings.CHAT_SUMMARY_MAX_TOKENS
+        )
+        
+        # Only advance from the mark we summarised from, in case another worker got there first
+        await db.execute(
+            update(ChatSession)
+            .filter(
+                ChatSession.id == session_id,
+                func.coalesce(ChatSession.summary_message_id, 0) == (session.summary_message_id or 0)
+            )
+            .values(summary=summary.strip(), summary_message_id=to_fold[-1].id)
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+
+    async def shutdown(self):
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+
+chat_summarizer = ChatSummarizer()
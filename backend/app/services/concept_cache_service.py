@@ -0,0 +1,129 @@
+import hashlib
+import re
+import unicodedata
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+from sqlalchemy import delete, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from config import settings
+from database import AsyncSessionLocal
+from app.models.academic import ConceptCache
+from app.agents.academic_agent import AcademicAgent
+from app.utils.single_flight import generation_flights
+
+# Only refresh last_used_at this often so hot entries don't write on every hit
+LRU_TOUCH_INTERVAL = timedelta(hours=1)
+
+
+def normalize_subject_name(name: str) -> str:
+    """Fold case, punctuation and whitespace so equivalent course names share a key."""
+    folded = unicodedata.normalize("NFKC", name).casefold()
+    # Keep '+' and '#' so "C++" and "C#" don't collapse into "C"
+    folded = re.sub(r"[^\w\s+#]", " ", folded)
+    return " ".join(folded.split())
+
+
+def subject_cache_key(name: str) -> str:
+    """Content address for a subject name."""
+    return hashlib.sha256(normalize_subject_name(name).encode("utf-8")).hexdigest()
+
+
+class ConceptCacheService:
+    """Persistent, shared cache of AI-generated subject concepts.
+
+    Reads and writes use their own sessions, so they never commit the
+    caller's transaction. The retention sweeper trims the table with ``evict``.
+    """
+
+    @staticmethod
+    async def get(subject_name: str) -> Optional[List[str]]:
+        """Return cached concepts for a subject, or None on miss/expiry."""
+        now = datetime.now(timezone.utc)
+        key = subject_cache_key(subject_name)
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(select(ConceptCache).filter(
+                ConceptCache.subject_key == key,
+                ConceptCache.created_at >= now - timedelta(hours=settings.CONCEPT_CACHE_TTL_HOURS)
+            ))
+            entry = result.scalars().first()
+
+            if not entry:
+                return None
+
+            concepts = list(entry.concepts)
+            await db.execute(
+                update(ConceptCache)
+                .where(ConceptCache.id == entry.id, ConceptCache.last_used_at < now - LRU_TOUCH_INTERVAL)
+                .values(last_used_at=now)
+                .execution_options(synchronize_session=False)
+            )
+            await db.commit()
+        return concepts
+
+    @staticmethod
+    async def put(subject_name: str, concepts: List[str]) -> None:
+        """Store concepts, replacing any existing entry for the subject."""
+        key = subject_cache_key(subject_name)
+        now = datetime.now(timezone.utc)
+
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(select(ConceptCache).filter(ConceptCache.subject_key == key))
+            entry = result.scalars().first()
+
+            if entry:
+                # Expired or regenerated entry - refresh it in place
+                entry.concepts = concepts
+                entry.created_at = now
+                entry.last_used_at = now
+            else:
+                db.add(ConceptCache(
+                    subject_key=key,
+                    normalized_name=normalize_subject_name(subject_name),
+                    concepts=concepts,
+                    created_at=now,
+                    last_used_at=now
+                ))
+            try:
+                await db.commit()
+            except IntegrityError:
+                # Another worker cached the same subject concurrently
+                await db.rollback()
+
+    @staticmethod
+    async def evict(db: AsyncSession) -> int:
+        """Trim the cache to CONCEPT_CACHE_MAX_ENTRIES, dropping least recently used rows."""
+        stale_ids = select(ConceptCache.id).order_by(
+            ConceptCache.last_used_at.desc()
+        ).offset(settings.CONCEPT_CACHE_MAX_ENTRIES).subquery()
+
+        result = await db.execute(
+            delete(ConceptCache)
+            .where(ConceptCache.id.in_(select(stale_ids.c.id)))
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+        return result.rowcount
+
+    @staticmethod
+    async def get_or_generate(subject_name: str, refresh: bool = False) -> List[str]:
+        """Serve concepts from the cache, calling the LLM only on a miss.
+
+        ``refresh`` skips the cache read and replaces the entry with the new result.
+        """
+        if not refresh:
+            cached = await ConceptCacheService.get(subject_name)
+            if cached is not None:
+                return cached
+
+        # Concurrent misses for the same subject share one LLM call
+        concepts = await generation_flights.run(
+            ("concepts", subject_cache_key(subject_name)),
+            lambda: AcademicAgent.generate_subject_concepts(subject_name)
+        )
+
+        # Never cache the generic fallback - retry the LLM next time instead
+        if concepts and concepts != AcademicAgent.fallback_concepts(subject_name):
+            await ConceptCacheService.put(subject_name, concepts)
+
+        return concepts
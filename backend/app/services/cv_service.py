@@ -0,0 +1,69 @@
+from typing import Any, Dict, Literal
+from fastapi import HTTPException
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.cv import CV
+from app.utils.jsonb import json_append, json_is_array, json_length, json_set
+from app.services.dashboard_service import dashboard_cache
+
+# CV columns holding a JSON array of entries
+CVSection = Literal["education", "experience", "certifications", "projects"]
+
+
+class CVService:
+    """In-database edits to the JSON sections of a user's CV.
+
+    Each edit is a single UPDATE built from ``json_append`` / ``json_set``, so
+    the rest of the document is never loaded or rewritten from Python.
+    """
+
+    @staticmethod
+    async def append_entry(db: AsyncSession, user_id: int, section: CVSection, entry: Dict[str, Any]) -> int:
+        """Append ``entry`` to a section and return its index."""
+        column = getattr(CV, section)
+        result = await db.execute(
+            update(CV)
+            .filter(CV.user_id == user_id, json_is_array(column))
+            .values({column: json_append(column, entry), CV.updated_at: func.now()})
+            .returning(json_length(column))
+            .execution_options(synchronize_session=False)
+        )
+        length = result.scalar_one_or_none()
+        if length is None:
+            await CVService._raise_not_updated(db, user_id, section)
+        await db.commit()
+        # Core UPDATEs bypass the flush hooks that normally invalidate the dashboard
+        dashboard_cache.invalidate(user_id)
+        return length - 1
+
+    @staticmethod
+    async def update_entry(db: AsyncSession, user_id: int, section: CVSection, index: int, changes: Dict[str, Any]):
+        """Set the given fields on one entry of a section, leaving its other fields alone."""
+        column = getattr(CV, section)
+        value = column
+        for key, field_value in changes.items():
+            value = json_set(value, [index, key], field_value)
+
+        result = await db.execute(
+            update(CV)
+            .filter(CV.user_id == user_id, json_length(column) > index)
+            .values({column: value, CV.updated_at: func.now()})
+            .execution_options(synchronize_session=False)
+        )
+        if not result.rowcount:
+            await CVService._raise_not_updated(db, user_id, section)
+            raise HTTPException(status_code=404, detail="CV entry not found")
+        await db.commit()
+        dashboard_cache.invalidate(user_id)
+
+    @staticmethod
+    async def _raise_not_updated(db: AsyncSession, user_id: int, section: CVSection):
+        """Raise the reason an edit matched no CV row: no CV, or a section that isn't a list."""
+        column = getattr(CV, section)
+        result = await db.execute(select(json_is_array(column)).filter(CV.user_id == user_id))
+        is_array = result.scalar_one_or_none()
+        if is_array is None:
+            raise HTTPException(status_code=404, detail="No CV found. Save one first.")
+        if not is_array:
+            # e.g. education written as a single object by CV generation
+            raise HTTPException(status_code=409, detail=f"CV section '{section}' is not a list of entries")
@@ -0,0 +1,173 @@
+from sqlalchemy import case, event, func, inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from config import settings
+from app.models.academic import Subject, Skill, Concept
+from app.models.project import Project
+from app.models.cv import CV, Opportunity
+from app.schemas.dashboard import (
+    DashboardSummaryResponse, SubjectSummary, SkillSummary, ProjectSummary,
+    OpportunitySummary, CVSummary, DashboardSubject, DashboardSkill,
+    DashboardProject, DashboardOpportunity
+)
+from app.utils.cache import TTLCache
+
+# Per-worker cache of summaries; writes on this worker evict the user's entry,
+# other workers catch up within the TTL
+dashboard_cache = TTLCache(settings.DASHBOARD_CACHE_TTL_SECONDS, settings.DASHBOARD_CACHE_MAX_ENTRIES)
+
+# Models whose rows feed the dashboard
+DASHBOARD_MODELS = (Subject, Skill, Project, CV, Opportunity)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_dashboard_writes(session, flush_context):
+    """Remember which users' dashboard data this transaction touched."""
+    touched = session.info.setdefault("dashboard_user_ids", set())
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, DASHBOARD_MODELS):
+            # Read the loaded value directly; async sessions can't lazy-load here
+            user_id = inspect(obj).dict.get("user_id")
+            if user_id is not None:
+                touched.add(user_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_dashboard_cache(session):
+    for user_id in session.info.pop("dashboard_user_ids", ()):
+        dashboard_cache.invalidate(user_id)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_dashboard_writes(session, previous_transaction):
+    session.info.pop("dashboard_user_ids", None)
+
+
+def _status_key(value) -> str:
+    return getattr(value, "value", value) or "unknown"
+
+
+class DashboardService:
+    
+    @staticmethod
+    async def get_summary(db: AsyncSession, user_id: int) -> DashboardSummaryResponse:
+        """Dashboard summary for the user, from the cache when it is fresh.
+        
+        ORM writes evict the user's entry on commit. Bulk Core statements
+        don't go through the flush, so their callers evict it themselves.
+        """
+        summary = dashboard_cache.get(user_id)
+        if summary is None:
+            summary = await DashboardService.build_summary(db, user_id)
+            dashboard_cache.put(user_id, summary)
+        return summary
+    
+    @staticmethod
+    async def build_summary(db: AsyncSession, user_id: int) -> DashboardSummaryResponse:
+        """Counts, averages and top items for every dashboard card."""
+        top_n = settings.DASHBOARD_TOP_N
+        
+        # Per-status counts and averages
+        result = await db.execute(
+            select(Subject.status, func.count(Subject.id), func.avg(Subject.progress))
+            .filter(Subject.user_id == user_id)
+            .group_by(Subject.status)
+        )
+        subject_groups = result.all()
+        
+        result = await db.execute(
+            select(Project.status, func.count(Project.id), func.avg(Project.completion_percentage))
+            .filter(Project.user_id == user_id)
+            .group_by(Project.status)
+        )
+        project_groups = result.all()
+        
+        # Single-row aggregates for the remaining cards
+        result = await db.execute(select(
+            select(func.count(Skill.id)).filter(Skill.user_id == user_id).scalar_subquery(),
+            select(func.avg(Skill.proficiency_level)).filter(Skill.user_id == user_id).scalar_subquery(),
+            select(func.count(Opportunity.id)).filter(Opportunity.user_id == user_id).scalar_subquery(),
+            select(func.sum(case((Opportunity.applied.is_(True), 1), else_=0)))
+                .filter(Opportunity.user_id == user_id).scalar_subquery(),
+            select(CV.updated_at).filter(CV.user_id == user_id).limit(1).scalar_subquery(),
+            select(func.count(CV.id)).filter(CV.user_id == user_id).scalar_subquery(),
+        ))
+        skill_count, skill_avg, opportunity_count, applied_count, cv_updated_at, cv_count = result.one()
+        
+        result = await db.execute(
+            select(func.count(Concept.id), func.sum(case((Concept.learned.is_(True), 1), else_=0)))
+            .join(Subject, Subject.id == Concept.subject_id)
+            .filter(Subject.user_id == user_id)
+        )
+        concepts_total, concepts_learned = result.one()
+        
+        # Top-N items per card
+        result = await db.execute(
+            select(Subject.id, Subject.name, Subject.code, Subject.status, Subject.progress)
+            .filter(Subject.user_id == user_id)
+            .order_by(Subject.created_at.desc(), Subject.id.desc())
+            .limit(top_n)
+        )
+        recent_subjects = [DashboardSubject(**row._mapping) for row in result]
+        
+        result = await db.execute(
+            select(Skill.id, Skill.name, Skill.category, Skill.proficiency_level)
+            .filter(Skill.user_id == user_id)
+            .order_by(Skill.proficiency_level.desc(), Skill.id)
+            .limit(top_n)
+        )
+        top_skills = [DashboardSkill(**row._mapping) for row in result]
+        
+        result = await db.execute(
+            select(Project.id, Project.title, Project.status, Project.completion_percentage)
+            .filter(Project.user_id == user_id)
+            .order_by(Project.created_at.desc(), Project.id.desc())
+            .limit(top_n)
+        )
+        recent_projects = [
+            DashboardProject(**{**row._mapping, "status": _status_key(row.status)})
+            for row in result
+        ]
+        
+        result = await db.execute(
+            select(Opportunity.id, Opportunity.title, Opportunity.company, Opportunity.match_score, Opportunity.applied)
+            .filter(Opportunity.user_id == user_id)
+            .order_by(Opportunity.match_score.desc(), Opportunity.id)
+            .limit(top_n)
+        )
+        top_opportunities = [DashboardOpportunity(**row._mapping) for row in result]
+        
+        subject_total = sum(count for _, count, _ in subject_groups)
+        project_total = sum(count for _, count, _ in project_groups)
+        
+        return DashboardSummaryResponse(
+            subjects=SubjectSummary(
+                total=subject_total,
+                by_status={_status_key(status): count for status, count, _ in subject_groups},
+                average_progress=round(
+                    sum((avg or 0) * count for _, count, avg in subject_groups) / subject_total, 1
+                ) if subject_total else 0.0,
+                concepts_learned=concepts_learned or 0,
+                concepts_total=concepts_total,
+                recent=recent_subjects
+            ),
+            skills=SkillSummary(
+                total=skill_count or 0,
+                average_proficiency=round(float(skill_avg or 0), 1),
+                top=top_skills
+            ),
+            projects=ProjectSummary(
+                total=project_total,
+                by_status={_status_key(status): count for status, count, _ in project_groups},
+                average_completion=round(
+                    sum((avg or 0) * count for _, count, avg in project_groups) / project_total, 1
+                ) if project_total else 0.0,
+                recent=recent_projects
+            ),
+            opportunities=OpportunitySummary(
+                total=opportunity_count or 0,
+                applied=applied_count or 0,
+                top=top_opportunities
+            ),
+            cv=CVSummary(exists=bool(cv_count), updated_at=cv_updated_at)
+        )
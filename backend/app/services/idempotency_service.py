@@ -0,0 +1,134 @@
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Optional
+import anyio
+import orjson
+from fastapi import HTTPException, Response, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import delete, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from config import settings
+from database import AsyncSessionLocal
+from app.models.idempotency import IdempotencyKey
+
+# Response headers that are not stored for replay
+REGENERATED_HEADERS = {"content-length", "content-type"}
+
+
+class IdempotencyService:
+    """Replays the stored response when a request repeats its ``Idempotency-Key``.
+
+    Keys are scoped to the user and may only be used for one operation. The
+    first request claims the key by inserting a row, runs, and stores its
+    response; repeats get that response back (with ``Idempotent-Replayed:
+    true``) without running again, across workers and restarts. A repeat that
+    arrives while the first is still running gets 409. Failed requests release
+    their key so the client can retry. Bookkeeping uses its own sessions so it
+    never touches the caller's transaction.
+    """
+
+    @staticmethod
+    async def run(user_id: int, key: Optional[str], operation: str, func: Callable[[], Awaitable[Any]]):
+        """Run ``func`` once per (user, key) and return its result, or replay the first result."""
+        if not key:
+            return await func()
+
+        existing = await IdempotencyService._claim(user_id, key, operation)
+        if existing is not None:
+            return IdempotencyService._replay(existing, operation)
+
+        try:
+            result = await func()
+        except BaseException:
+            # Also on cancellation, or the key would stay "in progress" until it goes stale
+            with anyio.CancelScope(shield=True):
+                await IdempotencyService._release(user_id, key)
+            raise
+
+        status_code, body, headers = IdempotencyService._encode(result)
+        async with AsyncSessionLocal() as session:
+            await session.execute(
+                update(IdempotencyKey)
+                .filter(IdempotencyKey.user_id == user_id, IdempotencyKey.key == key)
+                .values(status_code=status_code, response=body, response_headers=headers)
+            )
+            await session.commit()
+        return result
+
+    @staticmethod
+    async def _claim(user_id: int, key: str, operation: str) -> Optional[IdempotencyKey]:
+        """Insert the key, or return the existing row if another request holds it."""
+        now = datetime.now(timezone.utc)
+        async with AsyncSessionLocal() as session:
+            # An expired key, or one whose request died with its worker, is free again
+            await session.execute(
+                delete(IdempotencyKey)
+                .filter(
+                    IdempotencyKey.user_id == user_id,
+                    IdempotencyKey.key == key,
+                    or_(
+                        IdempotencyKey.created_at < now - timedelta(hours=settings.IDEMPOTENCY_KEY_TTL_HOURS),
+                        (IdempotencyKey.status_code.is_(None)) & (
+                            IdempotencyKey.created_at < now - timedelta(seconds=settings.IDEMPOTENCY_PENDING_TIMEOUT_SECONDS)
+                        )
+                    )
+                )
+                .execution_options(synchronize_session=False)
+            )
+            session.add(IdempotencyKey(user_id=user_id, key=key, operation=operation, created_at=now))
+            try:
+                await session.commit()
+                return None
+            except IntegrityError:
+                await session.rollback()
+
+            result = await session.execute(select(IdempotencyKey).filter(
+                IdempotencyKey.user_id == user_id,
+                IdempotencyKey.key == key
+            ))
+            existing = result.scalars().first()
+            if existing is None:
+                # Released between our insert and select - treat as a conflict rather than loop
+                raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Request with this Idempotency-Key is in progress")
+            return existing
+
+    @staticmethod
+    def _replay(existing: IdempotencyKey, operation: str):
+        if existing.operation != operation:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="Idempotency-Key was already used for a different request"
+            )
+        if existing.status_code is None:
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Request with this Idempotency-Key is in progress")
+        return ORJSONResponse(
+            status_code=existing.status_code,
+            content=existing.response,
+            headers={**(existing.response_headers or {}), "Idempotent-Replayed": "true"}
+        )
+
+    @staticmethod
+    def _encode(result: Any) -> tuple:
+        """Status code, JSON body and headers to store for a result."""
+        if isinstance(result, Response):
+            # The replayed response sets its own body headers
+            headers = {
+                name: value for name, value in result.headers.items()
+                if name not in REGENERATED_HEADERS
+            }
+            return result.status_code, orjson.loads(result.body) if result.body else None, headers or None
+        return status.HTTP_200_OK, jsonable_encoder(result), None
+
+    @staticmethod
+    async def _release(user_id: int, key: str):
+        async with AsyncSessionLocal() as session:
+            await session.execute(
+                delete(IdempotencyKey)
+                .filter(
+                    IdempotencyKey.user_id == user_id,
+                    IdempotencyKey.key == key,
+                    IdempotencyKey.status_code.is_(None)
+                )
+                .execution_options(synchronize_session=False)
+            )
+            await session.commit()
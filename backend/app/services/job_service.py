@@ -0,0 +1,165 @@
+import asyncio
+import logging
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Optional
+from fastapi import HTTPException, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from config import settings
+from database import AsyncSessionLocal
+from app.models.job import Job, JobStatus
+
+logger = logging.getLogger(__name__)
+
+# A unit of work: receives its own DB session and returns a JSON-serialisable result
+JobFunc = Callable[[AsyncSession], Awaitable[Any]]
+
+
+class JobQueue:
+    """In-process background job runner with a bounded number of concurrent jobs.
+
+    Job state lives in the ``jobs`` table so clients can poll results after
+    the submitting request has finished, and across restarts. While a job is
+    queued or running its worker refreshes ``heartbeat_at``; a job whose
+    heartbeat stops was lost to a restart and is failed when next polled.
+    """
+
+    def __init__(self, max_workers: int):
+        self._semaphore = asyncio.Semaphore(max_workers)
+        self._tasks = set()
+        self._job_ids = set()
+        self._heartbeat_task: Optional[asyncio.Task] = None
+
+    async def submit(self, user_id: int, kind: str, func: JobFunc) -> Job:
+        """Persist a queued job and schedule it to run in the background."""
+        job = Job(
+            id=uuid.uuid4().hex,
+            user_id=user_id,
+            kind=kind,
+            status=JobStatus.QUEUED,
+            heartbeat_at=datetime.now(timezone.utc)
+        )
+        async with AsyncSessionLocal() as db:
+            db.add(job)
+            await db.commit()
+
+        self._job_ids.add(job.id)
+        if self._heartbeat_task is None:
+            self._heartbeat_task = asyncio.create_task(self._heartbeat())
+        task = asyncio.create_task(self._run(job.id, func))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return job
+
+    async def _run(self, job_id: str, func: JobFunc):
+        try:
+            async with self._semaphore:
+                started = await self._mark(
+                    job_id, JobStatus.QUEUED,
+                    status=JobStatus.RUNNING,
+                    started_at=datetime.now(timezone.utc)
+                )
+                if not started:
+                    # Already failed as interrupted; don't run it behind the client's back
+                    return
+                try:
+                    async with AsyncSessionLocal() as db:
+                        result = await asyncio.wait_for(func(db), timeout=settings.JOB_TIMEOUT_SECONDS)
+                    await self._mark(
+                        job_id, JobStatus.RUNNING,
+                        status=JobStatus.SUCCEEDED,
+                        result=jsonable_encoder(result),
+                        finished_at=datetime.now(timezone.utc)
+                    )
+                except HTTPException as e:
+                    await self._fail(job_id, str(e.detail))
+                except asyncio.TimeoutError:
+                    await self._fail(job_id, "Job timed out")
+                except Exception:
+                    logger.exception("Background job %s failed", job_id)
+                    await self._fail(job_id, "Job failed unexpectedly")
+        finally:
+            self._job_ids.discard(job_id)
+
+    async def _fail(self, job_id: str, error: str):
+        await self._mark(
+            job_id, JobStatus.RUNNING,
+            status=JobStatus.FAILED,
+            error=error,
+            finished_at=datetime.now(timezone.utc)
+        )
+
+    @staticmethod
+    async def _mark(job_id: str, expected_status: str, **values) -> bool:
+        """Move a job on from ``expected_status``; False if it is no longer in it."""
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                update(Job)
+                .filter(Job.id == job_id, Job.status == expected_status)
+                .values(**values)
+            )
+            await db.commit()
+            return bool(result.rowcount)
+
+    async def _heartbeat(self):
+        while True:
+            await asyncio.sleep(settings.JOB_HEARTBEAT_SECONDS)
+            if not self._job_ids:
+                continue
+            try:
+                async with AsyncSessionLocal() as db:
+                    await db.execute(
+                        update(Job)
+                        .filter(Job.id.in_(list(self._job_ids)))
+                        .values(heartbeat_at=datetime.now(timezone.utc))
+                    )
+                    await db.commit()
+            except Exception:
+                logger.exception("Job heartbeat failed")
+
+    async def get(self, db: AsyncSession, job_id: str, user_id: int) -> Optional[Job]:
+        """Load a job owned by the user, failing it if its worker stopped heartbeating."""
+        stale_before = datetime.now(timezone.utc) - timedelta(seconds=settings.JOB_STALE_AFTER_SECONDS)
+        result = await db.execute(
+            update(Job)
+            .filter(
+                Job.id == job_id,
+                Job.status.in_([JobStatus.QUEUED, JobStatus.RUNNING]),
+                func.coalesce(Job.heartbeat_at, Job.created_at) < stale_before
+            )
+            .values(status=JobStatus.FAILED, error="Job was interrupted", finished_at=datetime.now(timezone.utc))
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount:
+            await db.commit()
+
+        result = await db.execute(select(Job).filter(Job.id == job_id, Job.user_id == user_id))
+        return result.scalars().first()
+
+    async def shutdown(self):
+        """Cancel in-flight jobs; they are reported as interrupted once stale."""
+        if self._heartbeat_task is not None:
+            self._heartbeat_task.cancel()
+            self._heartbeat_task = None
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+
+job_queue = JobQueue(settings.JOB_MAX_WORKERS)
+
+
+async def run_or_enqueue(background: bool, db: AsyncSession, user_id: int, kind: str, func: JobFunc):
+    """Run ``func`` inline, or submit it as a job and return 202 with the job id."""
+    if not background:
+        return await func(db)
+
+    job = await job_queue.submit(user_id, kind, func)
+    return ORJSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
+        content={"job_id": job.id, "status": job.status},
+        headers={"Location": f"/api/jobs/{job.id}"}
+    )
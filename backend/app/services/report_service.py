@@ -0,0 +1,291 @@
+import asyncio
+import hashlib
+import json
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional
+from config import settings
+
+
+def activity_report_etag(report: dict) -> str:
+    """Strong ETag for a report snapshot; changes whenever its content does."""
+    canonical = json.dumps(report, sort_keys=True, separators=(",", ":"), default=str)
+    return '"' + hashlib.sha256(canonical.encode("utf-8")).hexdigest() + '"'
+
+
+def render_activity_report(report: dict) -> bytes:
+    """Render an activity report snapshot to PDF.
+
+    Runs in a worker process, so it only takes plain data (see
+    ``AuthService.get_activity_report_data``) and must stay at module level.
+    """
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib import colors
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib.units import inch
+    from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+    from reportlab.lib.enums import TA_CENTER
+    from io import BytesIO
+    from datetime import datetime
+    
+    user = report["user"]
+    subjects = report["subjects"]
+    projects = report["projects"]
+    
+    # Create PDF buffer
+    buffer = BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=letter, rightMargin=72, leftMargin=72,
+                            topMargin=72, bottomMargin=18)
+    
+    # Container for PDF elements
+    elements = []
+    
+    # Styles
+    styles = getSampleStyleSheet()
+    title_style = ParagraphStyle(
+        'CustomTitle',
+        parent=styles['Heading1'],
+        fontSize=24,
+        textColor=colors.HexColor('#2563eb'),
+        spaceAfter=30,
+        alignment=TA_CENTER
+    )
+    
+    heading_style = ParagraphStyle(
+        'CustomHeading',
+        parent=styles['Heading2'],
+        fontSize=16,
+        textColor=colors.HexColor('#1e40af'),
+        spaceAfter=12,
+        spaceBefore=12
+    )
+    
+    # Title
+    elements.append(Paragraph("EduPilot Activity Report", title_style))
+    elements.append(Spacer(1, 12))
+    
+    # User Info Section
+    user_info_data = [
+        ['User Information', ''],
+        ['Name:', user['full_name'] or 'N/A'],
+        ['Email:', user['email']],
+        ['Degree Program:', user['degree_program'] or 'N/A'],
+        ['Current Year:', str(user['current_year']) if user['current_year'] else 'N/A'],
+        ['Career Goal:', user['career_goal'] or 'N/A'],
+        ['Report Generated:', datetime.now().strftime('%B %d, %Y at %I:%M %p')],
+    ]
+    
+    user_table = Table(user_info_data, colWidths=[2*inch, 4*inch])
+    user_table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2563eb')),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 14),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black),
+        ('FONTNAME', (0, 1), (0, -1), 'Helvetica-Bold'),
+    ]))
+    elements.append(user_table)
+    elements.append(Spacer(1, 20))
+    
+    # Subjects Section
+    elements.append(Paragraph("Enrolled Subjects", heading_style))
+    if subjects:
+        subject_data = [['Subject Name', 'Code', 'Credits', 'Status', 'Created']]
+        for subject in subjects:
+            subject_data.append([
+                subject['name'],
+                subject['code'] or 'N/A',
+                str(subject['credits']) if subject['credits'] else 'N/A',
+                'Active',
+                subject['created_at'].strftime('%Y-%m-%d')
+            ])
+        
+        subject_table = Table(subject_data, colWidths=[2*inch, 1*inch, 0.8*inch, 0.8*inch, 1.2*inch])
+        subject_table.setStyle(TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#10b981')),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 10),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+            ('BACKGROUND', (0, 1), (-1, -1), colors.lightgrey),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black),
+        ]))
+        elements.append(subject_table)
+        elements.append(Spacer(1, 12))
+        elements.append(Paragraph(f"<b>Total Subjects: {len(subjects)}</b>", styles['Normal']))
+    else:
+        elements.append(Paragraph("No subjects enrolled yet.", styles['Normal']))
+    
+    elements.append(Spacer(1, 20))
+    
+    # Projects Section
+    elements.append(Paragraph("Projects", heading_style))
+    if projects:
+        project_data = [['Project Title', 'Status', 'Progress', 'Created']]
+        for project in projects:
+            # Use Paragraph for title to enable text wrapping
+            title_para = Paragraph(
+                project['title'] if len(project['title']) <= 45 else project['title'][:45] + '...',
+                styles['Normal']
+            )
+            # Extract clean status (handle enum values)
+            status_value = str(project['status']) if project['status'] else 'Not Started'
+            # Remove enum prefix if present (e.g., "ProjectStatus.COMPLETED" -> "COMPLETED")
+            if '.' in status_value:
+                status_value = status_value.split('.')[-1]
+            # Capitalize first letter only for better display
+            status_value = status_value.replace('_', ' ').title()
+            
+            # Set progress based on status
+            progress = project['completion_percentage'] or 0
+            status_upper = status_value.upper()
+            if 'COMPLETED' in status_upper or 'COMPLETE' in status_upper:
+                progress = 100
+            elif 'PROGRESS' in status_upper:
+                progress = 50
+            
+            project_data.append([
+                title_para,
+                status_value,
+                f"{progress}%",
+                project['created_at'].strftime('%Y-%m-%d')
+            ])
+        
+        project_table = Table(project_data, colWidths=[3*inch, 1.1*inch, 0.8*inch, 1.1*inch])
+        project_table.setStyle(TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#8b5cf6')),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (0, -1), 'LEFT'),
+            ('ALIGN', (1, 0), (-1, -1), 'CENTER'),
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 10),
+            ('FONTSIZE', (0, 1), (-1, -1), 8),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+            ('TOPPADDING', (0, 1), (-1, -1), 6),
+            ('BOTTOMPADDING', (0, 1), (-1, -1), 6),
+            ('LEFTPADDING', (0, 0), (-1, -1), 6),
+            ('RIGHTPADDING', (0, 0), (-1, -1), 6),
+            ('BACKGROUND', (0, 1), (-1, -1), colors.lightgrey),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black),
+        ]))
+        elements.append(project_table)
+        elements.append(Spacer(1, 12))
+        
+        # Project status summary
+        status_counts = {}
+        for project in projects:
+            status = project['status'] or 'Not Started'
+            status_counts[status] = status_counts.get(status, 0) + 1
+        
+        status_text = " | ".join([f"{status}: {count}" for status, count in status_counts.items()])
+        elements.append(Paragraph(f"<b>Total Projects: {len(projects)}</b> ({status_text})", styles['Normal']))
+    else:
+        elements.append(Paragraph("No projects created yet.", styles['Normal']))
+    
+    elements.append(Spacer(1, 30))
+    
+    # Summary Statistics
+    elements.append(Paragraph("Activity Summary", heading_style))
+    
+    # Calculate days active (handle timezone-aware datetime)
+    now = datetime.now(user['created_at'].tzinfo) if user['created_at'].tzinfo else datetime.now()
+    days_active = (now - user['created_at']).days
+    
+    summary_data = [
+        ['Metric', 'Count'],
+        ['Total Subjects', str(len(subjects))],
+        ['Total Projects', str(len(projects))],
+        ['Account Created', user['created_at'].strftime('%B %d, %Y')],
+        ['Days Active', str(days_active)],
+    ]
+    
+    summary_table = Table(summary_data, colWidths=[3*inch, 2*inch])
+    summary_table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#f59e0b')),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 12),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.lightgoldenrodyellow),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black),
+        ('FONTNAME', (0, 1), (0, -1), 'Helvetica-Bold'),
+    ]))
+    elements.append(summary_table)
+    
+    # Build PDF
+    doc.build(elements)
+    
+    # Get PDF content
+    pdf_content = buffer.getvalue()
+    buffer.close()
+    
+    return pdf_content
+
+
+class ActivityReportRenderer:
+    """Renders activity reports off the event loop and caches the PDF bytes.
+
+    ReportLab is CPU-bound, so rendering runs in a small process pool. Results
+    are cached by ETag (a hash of the report data), so an unchanged report is
+    only rendered once; a cached copy keeps its original "Report Generated" time.
+    """
+
+    def __init__(self, max_workers: int, max_entries: int):
+        self._max_workers = max_workers
+        self._max_entries = max_entries
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._cache: "OrderedDict[str, bytes]" = OrderedDict()
+        self._pending = {}
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self._max_workers)
+        return self._executor
+
+    async def render(self, report: dict, etag: str) -> bytes:
+        """Return the PDF for ``report``, rendering it only on a cache miss."""
+        pdf = self._cache.get(etag)
+        if pdf is not None:
+            self._cache.move_to_end(etag)
+            return pdf
+        
+        # Concurrent downloads of the same report share one render
+        pending = self._pending.get(etag)
+        if pending is None:
+            executor = self.executor
+            future = asyncio.get_running_loop().run_in_executor(executor, render_activity_report, report)
+            pending = self._pending[etag] = (future, executor)
+        future, executor = pending
+        try:
+            pdf = await asyncio.shield(future)
+        except BrokenProcessPool:
+            # A worker died; release the broken pool and start a fresh one for
+            # the next request (unless another render already replaced it)
+            if self._executor is executor:
+                self._executor = None
+                executor.shutdown(wait=False, cancel_futures=True)
+            raise
+        finally:
+            self._pending.pop(etag, None)
+        
+        self._cache[etag] = pdf
+        self._cache.move_to_end(etag)
+        while len(self._cache) > self._max_entries:
+            self._cache.popitem(last=False)
+        return pdf
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+report_renderer = ActivityReportRenderer(settings.REPORT_RENDER_WORKERS, settings.REPORT_CACHE_MAX_ENTRIES)
@@ -0,0 +1,97 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional
+from sqlalchemy import delete, exists, select
+from config import settings
+from database import AsyncSessionLocal
+from app.models.chat import ChatSession, ChatMessage
+from app.models.idempotency import IdempotencyKey
+from app.models.job import Job
+from app.services.concept_cache_service import ConceptCacheService
+
+logger = logging.getLogger(__name__)
+
+
+class RetentionSweeper:
+    """Periodically deletes expired chat history, idempotency keys and jobs, and trims the concept cache.
+
+    Sessions older than ``CHAT_RETENTION_DAYS`` are removed with set-based
+    DELETEs in batches of ``RETENTION_BATCH_SIZE`` rows, each batch in its own
+    short transaction, so no large lock is held while a sweep runs.
+    """
+
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+        self.last_report: Optional[Dict] = None
+
+    async def _delete_in_batches(self, db, id_column, batch_filter) -> int:
+        deleted = 0
+        while True:
+            batch = select(id_column).filter(*batch_filter).limit(settings.RETENTION_BATCH_SIZE)
+            result = await db.execute(
+                delete(id_column.class_)
+                .filter(id_column.in_(batch))
+                .execution_options(synchronize_session=False)
+            )
+            await db.commit()
+            deleted += result.rowcount
+            if result.rowcount < settings.RETENTION_BATCH_SIZE:
+                return deleted
+
+    async def sweep(self) -> Dict:
+        """Run one sweep and return the number of rows deleted per table."""
+        started = datetime.now(timezone.utc)
+        cutoff = started - timedelta(days=settings.CHAT_RETENTION_DAYS)
+        expired_sessions = select(ChatSession.id).filter(ChatSession.created_at < cutoff)
+        
+        async with AsyncSessionLocal() as db:
+            messages = await self._delete_in_batches(
+                db, ChatMessage.id, [ChatMessage.session_id.in_(expired_sessions)]
+            )
+            # Sessions that got a new message mid-sweep are left for the next run
+            sessions = await self._delete_in_batches(db, ChatSession.id, [
+                ChatSession.created_at < cutoff,
+                ~exists().where(ChatMessage.session_id == ChatSession.id)
+            ])
+            idempotency_keys = await self._delete_in_batches(db, IdempotencyKey.id, [
+                IdempotencyKey.created_at < started - timedelta(hours=settings.IDEMPOTENCY_KEY_TTL_HOURS)
+            ])
+            # Unfinished jobs have no finished_at and are never matched
+            jobs = await self._delete_in_batches(db, Job.id, [
+                Job.finished_at < started - timedelta(days=settings.JOB_RETENTION_DAYS)
+            ])
+            concept_cache = await ConceptCacheService.evict(db)
+        
+        self.last_report = {
+            "chat_messages": messages,
+            "chat_sessions": sessions,
+            "idempotency_keys": idempotency_keys,
+            "jobs": jobs,
+            "concept_cache": concept_cache,
+            "cutoff": cutoff.isoformat(),
+            "duration_ms": round((datetime.now(timezone.utc) - started).total_seconds() * 1000, 1),
+        }
+        logger.debug("event=retention_sweep report=%s", self.last_report)
+        return self.last_report
+
+    async def _run(self):
+        while True:
+            try:
+                await self.sweep()
+            except Exception:
+                logger.exception("Retention sweep failed")
+            await asyncio.sleep(settings.RETENTION_SWEEP_INTERVAL_SECONDS)
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+
+retention_sweeper = RetentionSweeper()
@@ -0,0 +1,141 @@
+"""Storage for uploaded files.
+
+Uploads are streamed to a storage backend in ``UPLOAD_CHUNK_SIZE`` chunks and
+never held in memory whole. The SHA-256 is computed while the bytes are
+written, and files are stored under it, so identical documents are kept once.
+Backends implement ``StorageBackend``; only the local filesystem exists today,
+selected by ``STORAGE_BACKEND``.
+"""
+import hashlib
+import os
+import uuid
+from abc import ABC, abstractmethod
+from typing import AsyncIterator, Callable, Dict
+import anyio
+from fastapi import HTTPException, UploadFile, status
+from pydantic import BaseModel
+from config import settings
+
+
+class StoredFile(BaseModel):
+    key: str  # SHA-256 of the content, hex
+    size: int
+    created: bool  # False when identical content was already stored
+
+
+class StorageBackend(ABC):
+    """Content-addressed file store."""
+
+    @abstractmethod
+    async def put(self, chunks: AsyncIterator[bytes]) -> StoredFile:
+        """Consume ``chunks`` and store them under their SHA-256.
+
+        If ``chunks`` raises, nothing is stored and the error propagates.
+        """
+
+    @abstractmethod
+    async def exists(self, key: str) -> bool:
+        """Whether content with this key is stored."""
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        """Remove stored content; a missing key is not an error."""
+
+
+def _remove_quietly(path: str):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+class LocalFileStorage(StorageBackend):
+    """Files under ``root``, sharded as ``ab/cd/abcd...`` by their hash.
+
+    Each upload is written to ``root/tmp`` and then renamed into place, so a
+    partially written file is never visible under its key.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+
+    def path_for(self, key: str) -> str:
+        return os.path.join(self.root, key[:2], key[2:4], key)
+
+    async def put(self, chunks: AsyncIterator[bytes]) -> StoredFile:
+        tmp_dir = os.path.join(self.root, "tmp")
+        await anyio.to_thread.run_sync(lambda: os.makedirs(tmp_dir, exist_ok=True))
+        tmp_path = os.path.join(tmp_dir, uuid.uuid4().hex)
+        digest = hashlib.sha256()
+        size = 0
+        try:
+            async with await anyio.open_file(tmp_path, "wb") as f:
+                async for chunk in chunks:
+                    digest.update(chunk)
+                    size += len(chunk)
+                    await f.write(chunk)
+            key = digest.hexdigest()
+            created = await anyio.to_thread.run_sync(self._move_into_place, tmp_path, key)
+        except BaseException:
+            with anyio.CancelScope(shield=True):
+                await anyio.to_thread.run_sync(_remove_quietly, tmp_path)
+            raise
+        return StoredFile(key=key, size=size, created=created)
+
+    def _move_into_place(self, tmp_path: str, key: str) -> bool:
+        path = self.path_for(key)
+        if os.path.exists(path):
+            # Same bytes already stored - keep the existing copy
+            os.remove(tmp_path)
+            return False
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Atomic; a concurrent upload of the same content just replaces identical bytes
+        os.replace(tmp_path, path)
+        return True
+
+    async def exists(self, key: str) -> bool:
+        return await anyio.to_thread.run_sync(os.path.exists, self.path_for(key))
+
+    async def delete(self, key: str) -> None:
+        await anyio.to_thread.run_sync(_remove_quietly, self.path_for(key))
+
+
+# Register object-storage backends here
+STORAGE_BACKENDS: Dict[str, Callable[[], StorageBackend]] = {
+    "local": lambda: LocalFileStorage(settings.UPLOAD_DIR),
+}
+
+
+def create_storage(name: str) -> StorageBackend:
+    try:
+        return STORAGE_BACKENDS[name]()
+    except KeyError:
+        raise ValueError(f"Unknown STORAGE_BACKEND {name!r}; expected one of {', '.join(STORAGE_BACKENDS)}") from None
+
+
+file_storage = create_storage(settings.STORAGE_BACKEND)
+
+
+def _too_large() -> HTTPException:
+    limit_mb = settings.UPLOAD_MAX_BYTES / (1024 * 1024)
+    return HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"File is larger than the {limit_mb:g} MB limit"
+    )
+
+
+async def _read_chunks(upload: UploadFile) -> AsyncIterator[bytes]:
+    received = 0
+    while chunk := await upload.read(settings.UPLOAD_CHUNK_SIZE):
+        received += len(chunk)
+        if received > settings.UPLOAD_MAX_BYTES:
+            raise _too_large()
+        yield chunk
+
+
+async def save_upload(upload: UploadFile) -> StoredFile:
+    """Stream an upload into ``file_storage``, enforcing ``UPLOAD_MAX_BYTES``."""
+    # Reject before copying anything when the size is already known
+    if upload.size is not None and upload.size > settings.UPLOAD_MAX_BYTES:
+        raise _too_large()
+    return await file_storage.put(_read_chunks(upload))
@@ -4,13 +4,32 @@ from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from config import settings
+from database import get_async_db
+from app.models.user import User
+from app.schemas.user import UserResponse
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
 import hashlib
+import logging
+import os
+import random
+import threading
+import time
+
+logger = logging.getLogger(__name__)
 
 # Password hashing
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# bcrypt releases the GIL, so a thread pool lets hashes run in parallel across cores
+password_hash_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS or os.cpu_count() or 1,
+    thread_name_prefix="password-hash"
+)
+
 # Bearer token security
 security = HTTPBearer()
 
@@ -35,6 +54,65 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(normalized)
 
 
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password on the hashing pool instead of the event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(password_hash_executor, verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """Hash a password on the hashing pool instead of the event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(password_hash_executor, get_password_hash, password)
+
+
+class VerifiedTokenCache:
+    """Bounded LRU of recently verified JWT payloads, keyed by a digest of the token.
+
+    Entries are only served until the token's ``exp``, so an expired token
+    always falls through to full verification (and is rejected there).
+    """
+
+    def __init__(self, max_entries: int):
+        self._max_entries = max_entries
+        self._entries: "OrderedDict[bytes, dict]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(token: str) -> bytes:
+        return hashlib.sha256(token.encode("utf-8")).digest()
+
+    def get(self, key: bytes) -> Optional[dict]:
+        with self._lock:
+            payload = self._entries.get(key)
+            if payload is None:
+                return None
+            if payload.get("exp", 0) <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return payload
+
+    def put(self, key: bytes, payload: dict):
+        # Tokens without an expiry would never be re-verified, so don't cache them
+        if self._max_entries <= 0 or "exp" not in payload:
+            return
+        with self._lock:
+            self._entries[key] = payload
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+
+verified_tokens = VerifiedTokenCache(settings.AUTH_TOKEN_CACHE_SIZE)
+
+
+def _log_sampled(message: str, *args):
+    """Debug-level auth events, sampled so busy endpoints don't flood the logs."""
+    if logger.isEnabledFor(logging.DEBUG) and random.random() < settings.AUTH_LOG_SAMPLE_RATE:
+        logger.debug(message, *args)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create a JWT access token."""
     to_encode = data.copy()
@@ -44,34 +122,37 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
         expire = datetime.now(timezone.utc) + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     
     to_encode.update({"exp": expire})
-    print(f"Creating token with payload: {to_encode}")  # Debug log
     encoded_jwt = jwt.encode(to_encode, settings.JWT_SECRET, algorithm=settings.JWT_ALGORITHM)
-    print(f"Created token: {encoded_jwt}")  # Debug log
+    _log_sampled("event=token_created sub=%s exp=%s", to_encode.get("sub"), expire.isoformat())
     return encoded_jwt
 
 
 def decode_access_token(token: str) -> dict:
-    """Decode and verify a JWT token."""
+    """Decode and verify a JWT token, reusing recent verifications."""
+    key = VerifiedTokenCache.key(token)
+    payload = verified_tokens.get(key)
+    if payload is not None:
+        _log_sampled("event=token_verified cache=hit sub=%s token=%s", payload.get("sub"), key.hex()[:12])
+        return payload
+    
     try:
-        print(f"Attempting to decode token: {token[:50]}...")  # Debug log
         payload = jwt.decode(token, settings.JWT_SECRET, algorithms=[settings.JWT_ALGORITHM])
-        print(f"Successfully decoded payload: {payload}")  # Debug log
-        return payload
     except JWTError as e:
-        print(f"JWT Error: {type(e).__name__} - {str(e)}")  # Debug log
+        logger.info("event=token_rejected error=%s token=%s", type(e).__name__, key.hex()[:12])
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Could not validate credentials",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    
+    verified_tokens.put(key, payload)
+    _log_sampled("event=token_verified cache=miss sub=%s token=%s", payload.get("sub"), key.hex()[:12])
+    return payload
 
 
 async def get_current_user_id(credentials: HTTPAuthorizationCredentials = Depends(security)) -> int:
     """Get the current user ID from the JWT token."""
-    token = credentials.credentials
-    print(f"Received token: {token}")  # Debug log
-    payload = decode_access_token(token)
-    print(f"Decoded payload: {payload}")  # Debug log
+    payload = decode_access_token(credentials.credentials)
     user_id_str: str = payload.get("sub")
     
     if user_id_str is None:
@@ -92,3 +173,19 @@ async def get_current_user_id(credentials: HTTPAuthorizationCredentials = Depend
         )
     
     return user_id
+
+
+async def load_user_profile(db: AsyncSession, user_id: int) -> UserResponse:
+    """Load the user's profile; not cached across requests, as any field but ``id`` can change."""
+    user = await db.get(User, user_id)
+    if not user:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+    return UserResponse.model_validate(user)
+
+
+async def get_current_user(
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_async_db)
+) -> UserResponse:
+    """Get the current user's profile, loaded at most once per request."""
+    return await load_user_profile(db, user_id)
@@ -0,0 +1,121 @@
+"""JSON document columns and in-database partial updates.
+
+Documents are stored as JSONB on PostgreSQL, so they can be GIN-indexed and
+changed in place with ``jsonb_set`` / ``||``. On other databases they are
+plain JSON, and the SQLite JSON1 functions give the same behaviour. The
+expressions below are meant for ``update(...).values(...)``, so a change
+never round-trips the whole document through Python:
+
+    update(CV).filter(CV.user_id == user_id).values(projects=json_append(CV.projects, entry))
+
+Paths are sequences of object keys (str) and array indexes (int). As with
+``jsonb_set``, only the last path element is created if it is missing.
+"""
+from typing import Any, Sequence, Union
+from sqlalchemy import JSON, Boolean, Integer, Text, literal
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+
+JSONDocument = JSON().with_variant(JSONB(), "postgresql")
+
+PathElement = Union[str, int]
+
+
+def _sqlite_path(path: Sequence[PathElement]) -> str:
+    parts = ["$"]
+    for key in path:
+        parts.append(f"[{key}]" if isinstance(key, int) else '."' + key.replace('"', '\\"') + '"')
+    return "".join(parts)
+
+
+class json_set(FunctionElement):
+    """``column`` with the value at ``path`` replaced by ``value``."""
+    type = JSONDocument
+    name = "json_set"
+    inherit_cache = True
+
+    def __init__(self, column, path: Sequence[PathElement], value: Any):
+        super().__init__(
+            column,
+            literal([str(key) for key in path], ARRAY(Text)),
+            literal(_sqlite_path(path)),
+            literal(value, JSONDocument)
+        )
+
+
+class json_append(FunctionElement):
+    """``column`` (a JSON array, NULL treated as empty) with ``value`` appended."""
+    type = JSONDocument
+    name = "json_append"
+    inherit_cache = True
+
+    def __init__(self, column, value: Any):
+        super().__init__(column, literal(value, JSONDocument))
+
+
+class json_length(FunctionElement):
+    """Number of elements in a JSON array column (0 when NULL, NULL when not an array)."""
+    type = Integer()
+    name = "json_length"
+    inherit_cache = True
+
+
+class json_is_array(FunctionElement):
+    """Whether a JSON column holds an array (true when NULL)."""
+    type = Boolean()
+    name = "json_is_array"
+    inherit_cache = True
+
+
+@compiles(json_set, "postgresql")
+def _pg_json_set(element, compiler, **kw):
+    column, path, _, value = element.clauses
+    return (
+        f"jsonb_set(COALESCE({compiler.process(column, **kw)}, '{{}}'::jsonb), "
+        f"{compiler.process(path, **kw)}, CAST({compiler.process(value, **kw)} AS JSONB), true)"
+    )
+
+
+@compiles(json_set)
+def _json_set(element, compiler, **kw):
+    column, _, path, value = element.clauses
+    return (
+        f"json_set(COALESCE({compiler.process(column, **kw)}, '{{}}'), "
+        f"{compiler.process(path, **kw)}, json({compiler.process(value, **kw)}))"
+    )
+
+
+@compiles(json_append, "postgresql")
+def _pg_json_append(element, compiler, **kw):
+    column, value = (compiler.process(c, **kw) for c in element.clauses)
+    return f"(COALESCE({column}, '[]'::jsonb) || jsonb_build_array(CAST({value} AS JSONB)))"
+
+
+@compiles(json_append)
+def _json_append(element, compiler, **kw):
+    column, value = (compiler.process(c, **kw) for c in element.clauses)
+    return f"json_insert(COALESCE({column}, '[]'), '$[#]', json({value}))"
+
+
+@compiles(json_length, "postgresql")
+def _pg_json_length(element, compiler, **kw):
+    # jsonb_array_length raises on objects and scalars; CASE keeps it from seeing them
+    column = f"COALESCE({compiler.process(element.clauses, **kw)}, '[]'::jsonb)"
+    return f"CASE WHEN jsonb_typeof({column}) = 'array' THEN jsonb_array_length({column}) END"
+
+
+@compiles(json_length)
+def _json_length(element, compiler, **kw):
+    column = f"COALESCE({compiler.process(element.clauses, **kw)}, '[]')"
+    return f"CASE WHEN json_type({column}) = 'array' THEN json_array_length({column}) END"
+
+
+@compiles(json_is_array, "postgresql")
+def _pg_json_is_array(element, compiler, **kw):
+    return f"(jsonb_typeof(COALESCE({compiler.process(element.clauses, **kw)}, '[]'::jsonb)) = 'array')"
+
+
+@compiles(json_is_array)
+def _json_is_array(element, compiler, **kw):
+    return f"(json_type(COALESCE({compiler.process(element.clauses, **kw)}, '[]')) = 'array')"
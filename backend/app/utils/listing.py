@@ -0,0 +1,125 @@
+"""Cursor pagination and sparse fieldsets for list endpoints.
+
+List endpoints keep returning a plain JSON array. When ``limit`` is given,
+only that many items are returned, and the ``X-Next-Cursor`` response header
+holds an opaque cursor for the next page (pass it back as ``?cursor=``). The
+header is absent on the last page. ``fields=a,b,c`` limits the columns
+loaded and returned. ``id`` and the sort keys are always included.
+"""
+import base64
+import json
+from functools import lru_cache
+from typing import Iterable, List, Optional
+from fastapi import HTTPException, Query, Response
+from fastapi.responses import ORJSONResponse
+from pydantic import TypeAdapter
+from sqlalchemy import tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+class ListParams:
+    """Common query parameters for paginated list endpoints."""
+
+    def __init__(
+        self,
+        limit: Optional[int] = Query(None, ge=1, le=100, description="Page size; omit to return every item"),
+        cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page"),
+        fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. id,name,status")
+    ):
+        self.limit = limit
+        self.cursor = cursor
+        self.fields = fields
+
+
+@lru_cache(maxsize=None)
+def list_adapter(schema) -> TypeAdapter:
+    return TypeAdapter(List[schema])
+
+
+def encode_cursor(values: list) -> str:
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> list:
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except ValueError:
+        values = None
+    if not isinstance(values, list) or len(values) != size:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return values
+
+
+def list_fields(model, schema=None) -> List[str]:
+    """Columns of ``model`` that may be requested via ``fields=`` (those in ``schema``, if given)."""
+    columns = model.__table__.columns.keys()
+    if schema is None:
+        return list(columns)
+    return [name for name in schema.model_fields if name in columns]
+
+
+def parse_fields(fields: Optional[str], allowed: Iterable[str]) -> Optional[List[str]]:
+    if not fields:
+        return None
+    requested = [f.strip() for f in fields.split(",") if f.strip()]
+    unknown = [f for f in requested if f not in allowed]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+    return requested
+
+
+async def paginate(
+    db: AsyncSession,
+    query,
+    model,
+    params: ListParams,
+    response: Response,
+    order_by: list,
+    descending: bool = False,
+    schema=None
+):
+    """Run a list query with keyset pagination over ``order_by`` and optional projection.
+
+    ``order_by`` must end in a unique column (normally ``id``) so pages never
+    overlap. With a ``schema`` the page is serialised here in one pass;
+    without one, ORM objects are returned for FastAPI to encode. ``fields=``
+    always returns plain dicts.
+    """
+    fields = parse_fields(params.fields, list_fields(model, schema))
+    
+    if fields is not None:
+        keys = list(dict.fromkeys(["id", *fields, *(col.key for col in order_by)]))
+        query = query.with_only_columns(*(getattr(model, key) for key in keys))
+    
+    if params.cursor:
+        values = decode_cursor(params.cursor, len(order_by))
+        position = tuple_(*order_by)
+        query = query.filter(position < tuple_(*values) if descending else position > tuple_(*values))
+    
+    query = query.order_by(*(col.desc() if descending else col for col in order_by))
+    if params.limit:
+        query = query.limit(params.limit + 1)
+    
+    result = await db.execute(query)
+    rows = result.all() if fields is not None else result.scalars().all()
+    
+    next_cursor = None
+    if params.limit and len(rows) > params.limit:
+        rows = rows[:params.limit]
+        last = rows[-1]
+        next_cursor = encode_cursor([getattr(last, col.key) for col in order_by])
+    
+    headers = {"X-Next-Cursor": next_cursor} if next_cursor else None
+    if fields is not None:
+        return ORJSONResponse(content=[dict(row._mapping) for row in rows], headers=headers)
+    
+    if schema is None:
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
+        return rows
+    
+    # Validate straight from the ORM rows and let pydantic-core write the JSON,
+    # skipping FastAPI's second validation pass and jsonable_encoder
+    adapter = list_adapter(schema)
+    body = adapter.dump_json(adapter.validate_python(rows, from_attributes=True))
+    return Response(content=body, media_type="application/json", headers=headers)
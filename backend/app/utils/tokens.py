@@ -0,0 +1,50 @@
+"""Token counting for LLM prompt budgets.
+
+Uses tiktoken's ``cl100k_base`` encoding when it is available. It is not
+Llama's exact tokenizer, but it lands within a few percent on English text.
+If tiktoken or its encoding file can't be loaded, for example on an offline
+host, a characters-per-token estimate is used instead.
+"""
+import logging
+import math
+from typing import Dict, List
+
+logger = logging.getLogger(__name__)
+
+# Chat-format overhead per message (role markers and separators)
+MESSAGE_OVERHEAD_TOKENS = 4
+
+_encoding = None
+_encoding_loaded = False
+
+
+def load_encoding():
+    """Load the tokenizer up front; the first load may download its encoding file."""
+    return _get_encoding()
+
+
+def _get_encoding():
+    global _encoding, _encoding_loaded
+    if not _encoding_loaded:
+        _encoding_loaded = True
+        try:
+            import tiktoken
+            _encoding = tiktoken.get_encoding("cl100k_base")
+        except Exception as e:
+            logger.warning("tiktoken unavailable, estimating token counts: %s", e)
+    return _encoding
+
+
+def count_tokens(text: str) -> int:
+    """Number of tokens in ``text``."""
+    if not text:
+        return 0
+    encoding = _get_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    return math.ceil(len(text) / 4)
+
+
+def count_message_tokens(messages: List[Dict[str, str]]) -> int:
+    """Number of prompt tokens for a list of chat messages."""
+    return sum(count_tokens(m["content"]) + MESSAGE_OVERHEAD_TOKENS for m in messages)
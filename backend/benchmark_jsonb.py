@@ -0,0 +1,106 @@
+"""
+Partial-update benchmark for JSON document columns.
+
+Flips one flag inside, and appends one entry to, a ~50 KB JSON array stored
+in a single row, two ways:
+
+    round-trip     SELECT the document, change it in Python, UPDATE the whole column (before)
+    in-database    one UPDATE using json_set / json_append (jsonb_set / || on PostgreSQL)
+
+Runs against DATABASE_URL in a scratch table that is dropped afterwards.
+Point it at PostgreSQL for representative numbers; SQLite works too.
+
+Usage:
+    python benchmark_jsonb.py [document_kb] [rounds]
+"""
+import os
+import sys
+import time
+
+# Settings require these; without a DATABASE_URL the benchmark uses in-memory SQLite
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("JWT_SECRET", "benchmark")
+
+from sqlalchemy import Column, Integer, MetaData, Table, create_engine, select, update
+from config import settings
+from app.utils.jsonb import JSONDocument, json_append, json_set
+
+metadata = MetaData()
+documents = Table(
+    "benchmark_jsonb_documents", metadata,
+    Column("id", Integer, primary_key=True),
+    Column("doc", JSONDocument),
+)
+
+ENTRY = {"title": "Entry", "description": "What this entry covers " * 18, "learned": False}
+
+
+def make_document(size_kb: int) -> list:
+    count = max(1, size_kb * 1024 // (len(str(ENTRY)) + 20))
+    return [{**ENTRY, "id": i} for i in range(count)]
+
+
+def toggle_round_trip(conn, index: int):
+    doc = conn.execute(select(documents.c.doc).filter(documents.c.id == 1)).scalar_one()
+    doc[index]["learned"] = not doc[index]["learned"]
+    conn.execute(update(documents).filter(documents.c.id == 1).values(doc=doc))
+
+
+def toggle_in_database(conn, index: int, learned: bool):
+    conn.execute(update(documents).filter(documents.c.id == 1).values(doc=json_set(documents.c.doc, [index, "learned"], learned)))
+
+
+def append_round_trip(conn, entry: dict):
+    doc = conn.execute(select(documents.c.doc).filter(documents.c.id == 1)).scalar_one()
+    conn.execute(update(documents).filter(documents.c.id == 1).values(doc=doc + [entry]))
+
+
+def append_in_database(conn, entry: dict):
+    conn.execute(update(documents).filter(documents.c.id == 1).values(doc=json_append(documents.c.doc, entry)))
+
+
+def bench(engine, label: str, operation, document: list, rounds: int, reset: bool, baseline: float = None) -> float:
+    total = 0.0
+    for i in range(rounds + 1):
+        if reset:
+            with engine.begin() as conn:
+                conn.execute(update(documents).filter(documents.c.id == 1).values(doc=document))
+        start = time.perf_counter()
+        with engine.begin() as conn:
+            operation(conn, i)
+        if i:  # first call warms up the statement cache
+            total += time.perf_counter() - start
+    per_call = total / rounds
+    speedup = f"{baseline / per_call:>9.1f}x" if baseline else f"{'':>10}"
+    print(f"{label:<22}{per_call * 1000:>10.3f}{speedup}")
+    return per_call
+
+
+def main():
+    size_kb = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    document = make_document(size_kb)
+    middle = len(document) // 2
+    entry = {**ENTRY, "id": len(document)}
+
+    engine = create_engine(settings.DATABASE_URL)
+    metadata.drop_all(engine)
+    metadata.create_all(engine)
+    try:
+        with engine.begin() as conn:
+            conn.execute(documents.insert().values(id=1, doc=document))
+
+        print(f"📦 {len(document)} entries (~{size_kb} KB) on {engine.dialect.name}, {rounds} rounds\n")
+        print(f"{'operation':<22}{'ms/call':>10}{'speedup':>10}")
+        baseline = bench(engine, "toggle round-trip", lambda conn, i: toggle_round_trip(conn, middle), document, rounds, reset=False)
+        bench(engine, "toggle in-database", lambda conn, i: toggle_in_database(conn, middle, i % 2 == 0), document, rounds, reset=False, baseline=baseline)
+        # Appends restore the original document before each (untimed) call so the size stays fixed
+        baseline = bench(engine, "append round-trip", lambda conn, i: append_round_trip(conn, entry), document, rounds, reset=True)
+        bench(engine, "append in-database", lambda conn, i: append_in_database(conn, entry), document, rounds, reset=True, baseline=baseline)
+    finally:
+        metadata.drop_all(engine)
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
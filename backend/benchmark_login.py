@@ -0,0 +1,88 @@
+"""
+Login throughput benchmark for password verification.
+
+Compares verifying bcrypt hashes inline on the event loop (how the login
+handler used to work) against verify_password_async, which the login
+handler uses, on the app's password_hash_executor. Concurrent logins should
+scale with the pool size and stay flat inline. The "max stall" column is
+the longest the event loop went without running other tasks during the run.
+
+Usage:
+    PASSWORD_HASH_WORKERS=4 python benchmark_login.py [concurrent_logins]
+
+Rerun with different PASSWORD_HASH_WORKERS values to compare pool sizes.
+"""
+import asyncio
+import os
+import sys
+import time
+
+# Settings require these even though the benchmark never touches the DB
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("JWT_SECRET", "benchmark")
+
+from app.utils.auth import (
+    get_password_hash_async,
+    password_hash_executor,
+    verify_password,
+    verify_password_async,
+)
+
+PASSWORD = "correct horse battery staple"
+
+
+async def measure(run_logins):
+    """Run the logins while a heartbeat task records the worst event-loop stall."""
+    max_stall = 0.0
+    done = asyncio.Event()
+
+    async def heartbeat():
+        nonlocal max_stall
+        last = time.perf_counter()
+        while not done.is_set():
+            await asyncio.sleep(0.005)
+            now = time.perf_counter()
+            max_stall = max(max_stall, now - last - 0.005)
+            last = now
+
+    beat = asyncio.create_task(heartbeat())
+    await asyncio.sleep(0)
+    start = time.perf_counter()
+    await run_logins()
+    elapsed = time.perf_counter() - start
+    done.set()
+    await beat
+    return elapsed, max_stall
+
+
+async def run_inline(hashed: str, logins: int):
+    async def login():
+        verify_password(PASSWORD, hashed)
+
+    return await measure(lambda: asyncio.gather(*(login() for _ in range(logins))))
+
+
+async def run_pool(hashed: str, logins: int):
+    return await measure(lambda: asyncio.gather(*(
+        verify_password_async(PASSWORD, hashed) for _ in range(logins)
+    )))
+
+
+async def main():
+    logins = int(sys.argv[1]) if len(sys.argv) > 1 else 32
+    hashed = await get_password_hash_async(PASSWORD)
+    cores = os.cpu_count() or 1
+    workers = password_hash_executor._max_workers
+
+    print(f"🔐 {logins} concurrent logins, {cores} CPU cores, {workers} hash workers\n")
+    print(f"{'mode':<16}{'seconds':>10}{'logins/s':>12}{'max stall ms':>15}")
+
+    elapsed, stall = await run_inline(hashed, logins)
+    print(f"{'inline':<16}{elapsed:>10.2f}{logins / elapsed:>12.1f}{stall * 1000:>15.1f}")
+
+    elapsed, stall = await run_pool(hashed, logins)
+    print(f"{f'pool x{workers}':<16}{elapsed:>10.2f}{logins / elapsed:>12.1f}{stall * 1000:>15.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
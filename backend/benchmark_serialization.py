@@ -0,0 +1,97 @@
+"""
+Response serialisation benchmark for the subject list endpoint.
+
+Serialises a list of subjects (each with concepts and a generated task) the
+way GET /api/academic/subjects used to, and the ways it does now:
+
+    stdlib json    FastAPI response_model validation + json.dumps (before)
+    orjson         the same validation, rendered by ORJSONResponse
+    adapter        one TypeAdapter validate + pydantic-core dump_json (list endpoints)
+
+Usage:
+    python benchmark_serialization.py [subjects] [rounds]
+"""
+import asyncio
+import os
+import sys
+import time
+from datetime import datetime, timezone
+from typing import List
+
+# Settings require these even though the benchmark never touches the DB
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("JWT_SECRET", "benchmark")
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+import app.models  # noqa: F401 - registers every mapper so Subject can be built
+from app.models.academic import Concept, Subject
+from app.schemas.academic import SubjectResponse
+from app.utils.listing import list_adapter
+
+TASK_TEXT = "Build a small project that applies every concept above. " * 40
+
+
+def make_subjects(count: int) -> List[Subject]:
+    now = datetime.now(timezone.utc)
+    return [
+        Subject(
+            id=i,
+            user_id=1,
+            name=f"Subject {i}",
+            code=f"CS{i:03d}",
+            semester=i % 8 + 1,
+            year=i % 4 + 1,
+            credits=3,
+            description="Course description " * 5,
+            status="in_progress",
+            progress=40,
+            version=1,
+            subject_data={},
+            concepts=[
+                Concept(id=i * 10 + n, subject_id=i, position=n, name=f"Concept {n}: " + "what it covers " * 6, learned=n % 2 == 0)
+                for n in range(1, 6)
+            ],
+            generated_task=TASK_TEXT,
+            created_at=now,
+        )
+        for i in range(1, count + 1)
+    ]
+
+
+async def bench(label: str, render, rounds: int, baseline: float = None) -> float:
+    body = await render()
+    start = time.perf_counter()
+    for _ in range(rounds):
+        await render()
+    per_call = (time.perf_counter() - start) / rounds
+    speedup = f"{baseline / per_call:>9.1f}x" if baseline else f"{'':>10}"
+    print(f"{label:<14}{per_call * 1000:>10.2f}{len(body) / 1024:>12.0f}{speedup}")
+    return per_call
+
+
+async def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    subjects = make_subjects(count)
+    field = create_response_field(name="Response_get_subjects", type_=List[SubjectResponse], mode="serialization")
+
+    async def via_fastapi(response_class):
+        content = await serialize_response(field=field, response_content=subjects)
+        return response_class(content=content).body
+
+    async def via_adapter():
+        adapter = list_adapter(SubjectResponse)
+        return adapter.dump_json(adapter.validate_python(subjects, from_attributes=True))
+
+    print(f"📦 {count} subjects, {rounds} rounds\n")
+    print(f"{'mode':<14}{'ms/call':>10}{'KB':>12}{'speedup':>10}")
+    baseline = await bench("stdlib json", lambda: via_fastapi(JSONResponse), rounds)
+    await bench("orjson", lambda: via_fastapi(ORJSONResponse), rounds, baseline)
+    await bench("adapter", via_adapter, rounds, baseline)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
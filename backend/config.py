@@ -1,18 +1,81 @@
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import List, Optional
 
 
 class Settings(BaseSettings):
     # Database
     DATABASE_URL: str
+    ASYNC_DATABASE_URL: Optional[str] = None  # Derived from DATABASE_URL when unset
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: int = 30  # Seconds to wait for a free connection
+    DB_POOL_RECYCLE: int = 1800  # Seconds before a connection is replaced
+    DB_ECHO: bool = False  # Log every SQL statement
     
     # JWT
     JWT_SECRET: str
     JWT_ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    PASSWORD_HASH_WORKERS: Optional[int] = None  # Defaults to CPU count
+    AUTH_TOKEN_CACHE_SIZE: int = 4096  # Recently verified tokens kept per worker (0 disables)
+    AUTH_LOG_SAMPLE_RATE: float = 0.01  # Fraction of successful auth events logged at DEBUG
     
     # OpenAI
     OPENAI_API_KEY: str = "not-set"
+    LLM_BASE_URL: str = "https://api.groq.com/openai/v1"
+    LLM_MODEL: str = "llama-3.1-8b-instant"
+    LLM_MAX_CONCURRENCY: int = 8  # In-flight completions per worker
+    LLM_MAX_CONNECTIONS: int = 20
+    LLM_TIMEOUT_SECONDS: float = 30.0
+    LLM_MAX_RETRIES: int = 2
+    
+    # EduBot chat prompts (token counts)
+    CHAT_PROMPT_TOKEN_BUDGET: int = 2000  # System prompt + summary + recent messages
+    CHAT_HISTORY_MAX_MESSAGES: int = 10
+    CHAT_PAGE_SIZE: int = 50  # Messages per page of chat history
+    CHAT_SUMMARY_TRIGGER_TOKENS: int = 1500  # Unsummarised history that triggers a summary refresh
+    CHAT_SUMMARY_KEEP_MESSAGES: int = 4  # Most recent messages kept out of the summary
+    CHAT_SUMMARY_MAX_TOKENS: int = 300
+    
+    # Chat retention (background sweeper)
+    CHAT_RETENTION_DAYS: int = 7
+    RETENTION_SWEEP_INTERVAL_SECONDS: int = 3600
+    RETENTION_BATCH_SIZE: int = 1000  # Rows deleted per transaction
+    
+    # Dashboard summary
+    DASHBOARD_TOP_N: int = 5  # Items listed per dashboard card
+    DASHBOARD_CACHE_TTL_SECONDS: int = 30  # 0 disables the per-user summary cache
+    DASHBOARD_CACHE_MAX_ENTRIES: int = 10000
+    
+    # Concept cache
+    CONCEPT_CACHE_TTL_HOURS: int = 720
+    CONCEPT_CACHE_MAX_ENTRIES: int = 10000  # Trimmed by the retention sweeper
+    
+    # Background jobs
+    JOB_MAX_WORKERS: int = 4  # Concurrent background jobs per worker
+    JOB_TIMEOUT_SECONDS: int = 300
+    JOB_HEARTBEAT_SECONDS: int = 60
+    JOB_STALE_AFTER_SECONDS: int = 900  # Unfinished jobs without a heartbeat for this long were lost to a restart
+    JOB_RETENTION_DAYS: int = 7  # Finished jobs are deleted by the retention sweeper after this
+    
+    # Idempotency-Key replays for AI generation endpoints
+    IDEMPOTENCY_KEY_TTL_HOURS: int = 24
+    IDEMPOTENCY_PENDING_TIMEOUT_SECONDS: int = 300  # An unfinished first request older than this lost its worker
+    
+    # Activity report PDFs
+    REPORT_RENDER_WORKERS: int = 2  # Processes rendering PDFs
+    REPORT_CACHE_MAX_ENTRIES: int = 128
+    
+    # Uploaded files (project documentation), stored by content hash
+    STORAGE_BACKEND: str = "local"
+    UPLOAD_DIR: str = "uploads"  # Root directory of the local backend
+    UPLOAD_MAX_BYTES: int = 10485760  # 10 MiB per file
+    UPLOAD_CHUNK_SIZE: int = 65536  # Bytes read and written at a time
+    
+    # Response compression (brotli is used when the package is installed)
+    COMPRESSION_MIN_SIZE: int = 1024  # Bytes; smaller responses are sent as-is
+    COMPRESSION_GZIP_LEVEL: int = 6  # 1 (fastest) - 9 (smallest)
+    COMPRESSION_BROTLI_QUALITY: int = 4  # 0 - 11; higher is too slow for dynamic responses
     
     # Application
     APP_NAME: str = "EduPilot"
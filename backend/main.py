@@ -1,18 +1,34 @@
+import anyio
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from config import settings
-from database import Base, engine
-from app.routes import auth, academic, projects, cv, opportunities, chat
+from database import Base, engine, pool_stats
+from app.routes import auth, academic, projects, cv, opportunities, chat, jobs, dashboard
+from app.agents.llm_gateway import llm_gateway
+from app.middleware.body_limit import BodySizeLimitMiddleware
+from app.middleware.compression import CompressionMiddleware
+from app.services.job_service import job_queue
+from app.services.chat_summary_service import chat_summarizer
+from app.services.report_service import report_renderer
+from app.services.retention_service import retention_sweeper
+from app.utils.tokens import load_encoding
 
 # Create database tables
 Base.metadata.create_all(bind=engine)
 
 app = FastAPI(
     title=settings.APP_NAME,
+    default_response_class=ORJSONResponse,
     version=settings.APP_VERSION,
     description="AI-Powered Student Career & Learning Co-Pilot"
 )
 
+# Refuse oversized bodies before they are spooled; the slack covers the
+# multipart framing and form fields around an upload of the maximum size.
+# Added first so it runs inside CORS and 413s still carry CORS headers.
+app.add_middleware(BodySizeLimitMiddleware, max_body_size=settings.UPLOAD_MAX_BYTES + 64 * 1024)
+
 # CORS Configuration
 app.add_middleware(
     CORSMiddleware,
@@ -20,6 +36,15 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag"],
+)
+
+# Compress large JSON responses; PDFs, images and SSE streams are left alone
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.COMPRESSION_MIN_SIZE,
+    gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+    brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
 )
 
 @app.get("/")
@@ -34,6 +59,29 @@ async def root():
 async def health_check():
     return {"status": "healthy"}
 
+@app.get("/health/db")
+async def database_health():
+    """Connection pool gauges (checked out, overflow, checkout wait)."""
+    return pool_stats()
+
+@app.get("/health/retention")
+async def retention_health():
+    """Rows deleted by the most recent chat retention sweep."""
+    return {"last_sweep": retention_sweeper.last_report}
+
+@app.on_event("startup")
+async def start_background_work():
+    await anyio.to_thread.run_sync(load_encoding)
+    retention_sweeper.start()
+
+@app.on_event("shutdown")
+async def shutdown_background_work():
+    await retention_sweeper.stop()
+    await job_queue.shutdown()
+    await chat_summarizer.shutdown()
+    await llm_gateway.close()
+    report_renderer.shutdown()
+
 # Register routers
 app.include_router(auth.router, prefix="/api/auth", tags=["Authentication"])
 app.include_router(academic.router, prefix="/api/academic", tags=["Academic"])
@@ -41,6 +89,8 @@ app.include_router(projects.router, prefix="/api/projects", tags=["Projects"])
 app.include_router(cv.router, prefix="/api/cv", tags=["CV"])
 app.include_router(opportunities.router, prefix="/api/opportunities", tags=["Opportunities"])
 app.include_router(chat.router, tags=["Chat"])
+app.include_router(jobs.router, prefix="/api/jobs", tags=["Jobs"])
+app.include_router(dashboard.router, prefix="/api/dashboard", tags=["Dashboard"])
 
 if __name__ == "__main__":
     import uvicorn
@@ -0,0 +1,40 @@
+"""
+Migration script to make chat messages cascade-delete with their session.
+Run this script to update the existing database schema.
+
+With ON DELETE CASCADE, clearing a user's chat history is a single
+DELETE on chat_sessions instead of one DELETE per message.
+"""
+import sys
+sys.path.insert(0, '.')
+
+from sqlalchemy import create_engine, text
+from config import settings
+
+# Create engine
+engine = create_engine(settings.DATABASE_URL)
+
+# Drop and re-add the foreign key in one statement so it is never missing
+migration_commands = [
+    """
+    ALTER TABLE chat_messages
+        DROP CONSTRAINT IF EXISTS chat_messages_session_id_fkey,
+        ADD CONSTRAINT chat_messages_session_id_fkey
+            FOREIGN KEY (session_id) REFERENCES chat_sessions (id) ON DELETE CASCADE
+    """,
+]
+
+def run_migration():
+    with engine.connect() as conn:
+        for cmd in migration_commands:
+            try:
+                conn.execute(text(cmd))
+                conn.commit()
+                print("Migration command executed successfully")
+            except Exception as e:
+                print(f"Migration error: {e}")
+    
+    print("Migration completed!")
+
+if __name__ == "__main__":
+    run_migration()
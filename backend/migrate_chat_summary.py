@@ -0,0 +1,33 @@
+"""
+Migration script to add rolling summary columns to the chat_sessions table.
+Run this script to update the existing database schema.
+"""
+import sys
+sys.path.insert(0, '.')
+
+from sqlalchemy import create_engine, text
+from config import settings
+
+# Create engine
+engine = create_engine(settings.DATABASE_URL)
+
+# SQL commands to add columns if they don't exist
+migration_commands = [
+    "ALTER TABLE chat_sessions ADD COLUMN IF NOT EXISTS summary TEXT",
+    "ALTER TABLE chat_sessions ADD COLUMN IF NOT EXISTS summary_message_id INTEGER",
+]
+
+def run_migration():
+    with engine.connect() as conn:
+        for cmd in migration_commands:
+            try:
+                conn.execute(text(cmd))
+                conn.commit()
+                print(f"Migration command executed successfully: {cmd}")
+            except Exception as e:
+                print(f"Migration error: {e}")
+    
+    print("Migration completed!")
+
+if __name__ == "__main__":
+    run_migration()
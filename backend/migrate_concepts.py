@@ -0,0 +1,87 @@
+"""
+Migration script to move concepts, submissions and the generated task out of
+the subjects.subject_data JSON column into their own tables/columns.
+Run this script to update the existing database schema and backfill it.
+
+The backfill runs in a single transaction and only touches subjects that have
+no rows in the new tables yet, so it is safe to re-run.
+"""
+import sys
+sys.path.insert(0, '.')
+
+from sqlalchemy import create_engine, text
+from config import settings
+
+# Create engine
+engine = create_engine(settings.DATABASE_URL)
+
+# SQL commands to create the new tables and columns if they don't exist
+migration_commands = [
+    "ALTER TABLE subjects ADD COLUMN IF NOT EXISTS generated_task TEXT",
+    """CREATE TABLE IF NOT EXISTS concepts (
+        id SERIAL PRIMARY KEY,
+        subject_id INTEGER NOT NULL REFERENCES subjects (id) ON DELETE CASCADE,
+        position INTEGER NOT NULL,
+        name VARCHAR NOT NULL,
+        learned BOOLEAN NOT NULL DEFAULT FALSE
+    )""",
+    "CREATE INDEX IF NOT EXISTS ix_concepts_id ON concepts (id)",
+    "CREATE INDEX IF NOT EXISTS ix_concepts_subject_id_position ON concepts (subject_id, position)",
+    """CREATE TABLE IF NOT EXISTS submissions (
+        id SERIAL PRIMARY KEY,
+        subject_id INTEGER NOT NULL REFERENCES subjects (id) ON DELETE CASCADE,
+        position INTEGER NOT NULL,
+        task TEXT,
+        github_link VARCHAR,
+        documentation VARCHAR,
+        submitted_at TIMESTAMP WITH TIME ZONE DEFAULT now()
+    )""",
+    "CREATE INDEX IF NOT EXISTS ix_submissions_id ON submissions (id)",
+    "CREATE INDEX IF NOT EXISTS ix_submissions_subject_id_position ON submissions (subject_id, position)",
+]
+
+# Copy the JSON arrays into rows, keeping their order as position
+backfill_commands = [
+    """INSERT INTO concepts (subject_id, position, name, learned)
+    SELECT s.id, c.position, c.value->>'name', COALESCE((c.value->>'learned')::boolean, FALSE)
+    FROM subjects s
+    CROSS JOIN LATERAL json_array_elements(s.subject_data->'concepts') WITH ORDINALITY AS c(value, position)
+    WHERE json_typeof(s.subject_data->'concepts') = 'array'
+      AND c.value->>'name' IS NOT NULL
+      AND NOT EXISTS (SELECT 1 FROM concepts x WHERE x.subject_id = s.id)""",
+    """INSERT INTO submissions (subject_id, position, task, github_link, documentation, submitted_at)
+    SELECT s.id, e.position, e.value->>'task', e.value->>'github_link', e.value->>'documentation',
+           COALESCE((e.value->>'submitted_at')::timestamptz, now())
+    FROM subjects s
+    CROSS JOIN LATERAL json_array_elements(s.subject_data->'submissions') WITH ORDINALITY AS e(value, position)
+    WHERE json_typeof(s.subject_data->'submissions') = 'array'
+      AND NOT EXISTS (SELECT 1 FROM submissions x WHERE x.subject_id = s.id)""",
+    """UPDATE subjects SET generated_task = subject_data->>'generated_task'
+    WHERE generated_task IS NULL AND subject_data->>'generated_task' IS NOT NULL""",
+    # documentation_submitted is now implied by a row in submissions
+    """UPDATE subjects
+    SET subject_data = (subject_data::jsonb - 'concepts' - 'submissions' - 'generated_task' - 'documentation_submitted')::json
+    WHERE subject_data IS NOT NULL AND json_typeof(subject_data) = 'object'""",
+]
+
+def run_migration():
+    with engine.connect() as conn:
+        for cmd in migration_commands:
+            try:
+                conn.execute(text(cmd))
+                conn.commit()
+                print(f"Migration command executed successfully: {cmd.splitlines()[0]}")
+            except Exception as e:
+                conn.rollback()
+                print(f"Migration error: {e}")
+
+    # All-or-nothing, so the JSON keys are only dropped once the rows exist
+    with engine.begin() as conn:
+        for cmd in backfill_commands:
+            result = conn.execute(text(cmd))
+            print(f"Backfill updated {result.rowcount} rows: {cmd.splitlines()[0]}")
+
+    print("Migration completed!")
+
+if __name__ == "__main__":
+    run_migration()
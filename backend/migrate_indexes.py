@@ -0,0 +1,46 @@
+"""
+Migration script to add indexes for per-user foreign keys and common filters.
+Run this script to update an existing database schema. New databases get
+these indexes from the models via Base.metadata.create_all.
+
+Indexes are built with CREATE INDEX CONCURRENTLY so large tables stay
+writable while the migration runs.
+"""
+import sys
+sys.path.insert(0, '.')
+
+from sqlalchemy import create_engine, text
+from config import settings
+
+# Create engine
+engine = create_engine(settings.DATABASE_URL)
+
+# Index names match the ones declared on the models
+migration_commands = [
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_subjects_user_id_lower_name ON subjects (user_id, lower(name))",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_skills_user_id_lower_name ON skills (user_id, lower(name))",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_skills_subject_id ON skills (subject_id)",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_projects_user_id_status ON projects (user_id, status)",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_milestones_user_id ON milestones (user_id)",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_milestones_project_id ON milestones (project_id)",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_opportunities_user_id_match_score ON opportunities (user_id, match_score)",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_chat_sessions_user_id_created_at ON chat_sessions (user_id, created_at)",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_chat_sessions_created_at ON chat_sessions (created_at)",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_chat_messages_session_id_created_at ON chat_messages (session_id, created_at)",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_chat_messages_session_id_id ON chat_messages (session_id, id)",
+]
+
+def run_migration():
+    # CONCURRENTLY cannot run inside a transaction block
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        for cmd in migration_commands:
+            try:
+                conn.execute(text(cmd))
+                print(f"Migration command executed successfully: {cmd}")
+            except Exception as e:
+                print(f"Migration error: {e}")
+
+    print("Migration completed!")
+
+if __name__ == "__main__":
+    run_migration()
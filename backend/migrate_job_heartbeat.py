@@ -0,0 +1,33 @@
+"""
+Migration script to add the job heartbeat column and retention index.
+Run this script to update the existing database schema.
+"""
+import sys
+sys.path.insert(0, '.')
+
+from sqlalchemy import create_engine, text
+from config import settings
+
+# Create engine
+engine = create_engine(settings.DATABASE_URL)
+
+# SQL commands to add the column and index if they don't exist
+migration_commands = [
+    "ALTER TABLE jobs ADD COLUMN IF NOT EXISTS heartbeat_at TIMESTAMP WITH TIME ZONE",
+    "CREATE INDEX IF NOT EXISTS ix_jobs_finished_at ON jobs (finished_at)",
+]
+
+def run_migration():
+    with engine.connect() as conn:
+        for cmd in migration_commands:
+            try:
+                conn.execute(text(cmd))
+                conn.commit()
+                print(f"Migration command executed successfully: {cmd}")
+            except Exception as e:
+                print(f"Migration error: {e}")
+    
+    print("Migration completed!")
+
+if __name__ == "__main__":
+    run_migration()
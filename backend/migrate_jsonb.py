@@ -0,0 +1,54 @@
+"""
+Migration script to convert the JSON document columns to JSONB and add a GIN
+index on subjects.subject_data.
+Run this script to update the existing database schema (PostgreSQL only).
+
+Changing a column type rewrites the table under an exclusive lock, so run it
+during a quiet period. The GIN index is then built CONCURRENTLY.
+"""
+import sys
+sys.path.insert(0, '.')
+
+from sqlalchemy import create_engine, text
+from config import settings
+
+# Create engine
+engine = create_engine(settings.DATABASE_URL)
+
+# Columns declared as JSONDocument on the models
+column_commands = [
+    "ALTER TABLE subjects ALTER COLUMN subject_data TYPE JSONB USING subject_data::jsonb",
+    "ALTER TABLE cvs ALTER COLUMN education TYPE JSONB USING education::jsonb",
+    "ALTER TABLE cvs ALTER COLUMN experience TYPE JSONB USING experience::jsonb",
+    "ALTER TABLE cvs ALTER COLUMN certifications TYPE JSONB USING certifications::jsonb",
+    "ALTER TABLE cvs ALTER COLUMN projects TYPE JSONB USING projects::jsonb",
+]
+
+index_commands = [
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_subjects_subject_data ON subjects USING gin (subject_data jsonb_path_ops)",
+]
+
+def run_migration():
+    with engine.connect() as conn:
+        for cmd in column_commands:
+            try:
+                conn.execute(text(cmd))
+                conn.commit()
+                print(f"Migration command executed successfully: {cmd}")
+            except Exception as e:
+                conn.rollback()
+                print(f"Migration error: {e}")
+
+    # CONCURRENTLY cannot run inside a transaction block
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        for cmd in index_commands:
+            try:
+                conn.execute(text(cmd))
+                print(f"Migration command executed successfully: {cmd}")
+            except Exception as e:
+                print(f"Migration error: {e}")
+
+    print("Migration completed!")
+
+if __name__ == "__main__":
+    run_migration()
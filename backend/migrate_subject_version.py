@@ -0,0 +1,32 @@
+"""
+Migration script to add the optimistic-concurrency version column to subjects.
+Run this script to update the existing database schema.
+"""
+import sys
+sys.path.insert(0, '.')
+
+from sqlalchemy import create_engine, text
+from config import settings
+
+# Create engine
+engine = create_engine(settings.DATABASE_URL)
+
+# SQL commands to add columns if they don't exist
+migration_commands = [
+    "ALTER TABLE subjects ADD COLUMN IF NOT EXISTS version INTEGER NOT NULL DEFAULT 1",
+]
+
+def run_migration():
+    with engine.connect() as conn:
+        for cmd in migration_commands:
+            try:
+                conn.execute(text(cmd))
+                conn.commit()
+                print(f"Migration command executed successfully: {cmd}")
+            except Exception as e:
+                print(f"Migration error: {e}")
+    
+    print("Migration completed!")
+
+if __name__ == "__main__":
+    run_migration()
@@ -283,8 +283,10 @@ function Subjects() {
   };
 
   const toggleConcept = async (subjectId, conceptId) => {
+    const current = subjects.find(subject => subject.id === subjectId);
     try {
-      const response = await fetch(`http://localhost:8000/api/academic/subjects/${subjectId}/concepts/${conceptId}/toggle`, {
+      // Send the version we rendered; the server answers 409 instead of applying a stale click
+      const response = await fetch(`http://localhost:8000/api/academic/subjects/${subjectId}/concepts/${conceptId}/toggle?version=${current.version}`, {
         method: 'PUT',
         headers: {
           'Authorization': `Bearer ${localStorage.getItem('token')}`
@@ -293,23 +295,29 @@ function Subjects() {
       
       const data = await response.json();
       
+      if (response.status === 409) {
+        // Another tab or click won; show the current state rather than retrying
+        setSubjects(subjects => subjects.map(subject => subject.id === subjectId ? data.subject : subject));
+        return;
+      }
+      if (!response.ok) {
+        throw new Error(data.detail);
+      }
+      
       // Update local state with new progress
-      setSubjects(subjects.map(subject => {
+      setSubjects(subjects => subjects.map(subject => {
         if (subject.id === subjectId) {
           const updatedConcepts = subject.concepts.map(concept => 
             concept.id === conceptId 
               ? { ...concept, learned: !concept.learned }
               : concept
           );
-          // Calculate local progress: 10% per concept learned
-          const learnedCount = updatedConcepts.filter(c => c.learned).length;
-          const hasDoc = subject.status === 'completed';
-          const newProgress = (learnedCount * 10) + (hasDoc ? 50 : 0);
           
           return {
             ...subject,
             concepts: updatedConcepts,
-            progress: data.progress || newProgress
+            progress: data.progress,
+            version: data.version
           };
         }
         return subject;
@@ -366,6 +374,7 @@ function Subjects() {
     formData.append('subject_id', selectedSubject.id);
     formData.append('task', generatedTask);
     formData.append('github_link', githubLink);
+    formData.append('version', subjects.find(s => s.id === selectedSubject.id)?.version ?? selectedSubject.version);
     formData.append('documentation', documentation);
 
     setSubmitting(true);
@@ -380,6 +389,11 @@ function Subjects() {
         body: formData
       });
 
+      if (response.status === 409) {
+        // Already submitted from another tab or click; show the current state
+        await fetchSubjects();
+        throw new Error('This course was updated elsewhere. Please check it and try again.');
+      }
       if (!response.ok) throw new Error('Failed to submit project');
       
       alert('Project submitted successfully! 🎉 Your project has been added to the Projects section.');